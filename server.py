@@ -4,52 +4,92 @@ Pennyworth Slack Bot - Cloud Run HTTP Server Wrapper
 import os
 import logging
 import threading
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from dotenv import load_dotenv
 
-from src.bot import PennyworthBot
+from src.log_config import configure_logging
 
-logging.basicConfig(
-    level=os.getenv('LOG_LEVEL', 'INFO'),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+load_dotenv()
+
+configure_logging()
 logger = logging.getLogger(__name__)
 
-load_dotenv()
+# Log every health check request (off by default; probes arrive every few seconds)
+LOG_HEALTHCHECKS = os.getenv('LOG_HEALTHCHECKS', 'false').lower() in ('1', 'true', 'yes')
+
+# Set once the bot has connected to Slack; readiness checks fail until then
+_ready = threading.Event()
+
+def _build_response(code, reason, body):
+    """Build a complete plain-text HTTP response once at import"""
+    return code, (
+        b'HTTP/1.1 ' + str(code).encode() + b' ' + reason + b'\r\n'
+        b'Content-Type: text/plain\r\n'
+        b'Content-Length: ' + str(len(body)).encode() + b'\r\n'
+        b'\r\n'
+    ), body
+
+# Health check responses (status code, header bytes, body bytes), built once
+HEALTH_RESPONSE = _build_response(200, b'OK', b'Health check OK')
+STARTING_RESPONSE = _build_response(503, b'Service Unavailable', b'Starting')
+LIVE_RESPONSE = _build_response(200, b'OK', b'OK')
 
 class HealthCheckHandler(BaseHTTPRequestHandler):
     """HTTP Handler for Cloud Run health checks"""
+    protocol_version = 'HTTP/1.1'
+
+    def _response(self):
+        """Pick the response: /livez is always up, everything else waits for the bot"""
+        if self.path == '/livez':
+            return LIVE_RESPONSE
+        return HEALTH_RESPONSE if _ready.is_set() else STARTING_RESPONSE
+
     def do_GET(self):
-        self.send_response(200)
-        self.send_header('Content-type', 'text/plain')
-        self.end_headers()
-        self.wfile.write(b'Health check OK')
+        code, headers, body = self._response()
+        self.wfile.write(headers + body)
+        if LOG_HEALTHCHECKS:
+            # Prebuilt responses bypass send_response, so log the request here
+            self.log_request(code, len(body))
+    
+    def do_HEAD(self):
+        code, headers, _ = self._response()
+        self.wfile.write(headers)
+        if LOG_HEALTHCHECKS:
+            self.log_request(code)
     
     def log_message(self, format, *args):
-        logger.info("%s - %s" % (self.address_string(), format % args))
+        # Request logs only arrive here when LOG_HEALTHCHECKS is set
+        logger.info("%s - %s", self.address_string(), format % args)
+    
+    def log_error(self, format, *args):
+        # Always logged (bad requests, send_error), regardless of LOG_HEALTHCHECKS
+        logger.warning("%s - %s", self.address_string(), format % args)
 
 def run_server():
     """Run the HTTP server for Cloud Run"""
     port = int(os.environ.get('PORT', 8080))
     server_address = ('', port)
     
-    logger.info(f"Starting HTTP server on port {port}")
+    logger.info("Starting HTTP server on port %s", port)
     
     try:
-        httpd = HTTPServer(server_address, HealthCheckHandler)
-        logger.info(f"HTTP server started successfully")
+        httpd = ThreadingHTTPServer(server_address, HealthCheckHandler)
+        logger.info("HTTP server started successfully")
         httpd.serve_forever()
     except Exception as e:
-        logger.error(f"Error starting HTTP server: {e}")
+        logger.error("Error starting HTTP server: %s", e)
         raise
 
 def start_bot():
     """Start the PennyworthBot instance"""
     try:
+        # Imported here so the health check server binds before the bot's heavy
+        # dependencies (slack_bolt, google-generativeai, py-trello, pytz) load
+        from src.bot import PennyworthBot
         bot = PennyworthBot()
-        bot.start()
+        bot.start(ready_event=_ready)
     except Exception as e:
-        logger.error(f"Error starting bot: {e}")
+        logger.error("Error starting bot: %s", e)
         raise
 
 if __name__ == "__main__":
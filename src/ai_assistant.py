@@ -4,10 +4,188 @@ Handles AI functionality using Google's Gemini API
 """
 
 import os
+import zlib
+import threading
+from collections import OrderedDict
 import google.generativeai as genai
-from typing import Optional, Dict, Any, Callable, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, Callable, Iterable, List, Sequence, Tuple
+from tenacity import retry, stop_after_attempt, wait_exponential
 import logging
 
+from src.llm_cache import LLMCache, PromptCache, RedisCache, SemanticCache, TemplateCache, make_key_hasher
+from src.rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+# Expected output tokens added to each prompt's rate-limit estimate
+RESPONSE_TOKEN_ESTIMATE = 512
+# Longest conversation text (in characters) sent for summarization; older text is dropped
+MAX_SUMMARY_CHARS = int(os.getenv('SUMMARY_CHAR_BUDGET', 12000))
+# Most recent thread messages included as context (callers keep at most this many)
+THREAD_CONTEXT_MESSAGES = 8
+# Channels whose last summary is kept as a fallback (least recently summarized are dropped)
+LAST_SUMMARY_CHANNELS = 256
+# Maximum concurrent Gemini calls for batch operations
+GEMINI_MAX_INFLIGHT = int(os.getenv('GEMINI_MAX_INFLIGHT', 8))
+
+# Shared pool for concurrent Gemini fan-out (batch_summarize)
+_EXECUTOR = ThreadPoolExecutor(max_workers=GEMINI_MAX_INFLIGHT, thread_name_prefix="gemini")
+
+# Persona shared by every prompt, sent once per model as its system instruction
+ALFRED_PERSONA = (
+    "You are Alfred Pennyworth from the Batman Arkham video game series. "
+    "Use a formal, dignified, and slightly sardonic tone. "
+    "Be helpful, wise, and occasionally witty, but always respectful. "
+    "Include subtle references to being a butler, as well as Batman comic book references, when appropriate."
+)
+
+# Generative models shared by every AIAssistant, keyed by model name. The persona
+# is a module constant and genai.configure() is process-wide, so the API key is
+# global rather than per instance: the bot runs with a single GEMINI_API_KEY.
+_MODEL_CACHE: Dict[str, genai.GenerativeModel] = {}
+_MODEL_CACHE_LOCK = threading.Lock()
+
+
+def _get_model(api_key: str, model_name: str) -> genai.GenerativeModel:
+    """Get the shared model, configuring the SDK (process-wide) on first use"""
+    with _MODEL_CACHE_LOCK:
+        model = _MODEL_CACHE.get(model_name)
+        if model is None:
+            genai.configure(api_key=api_key)
+            model = genai.GenerativeModel(model_name, system_instruction=ALFRED_PERSONA)
+            _MODEL_CACHE[model_name] = model
+        return model
+
+
+# Ask Gemini to phrase time replies instead of using the local templates
+LLM_TIME_RESPONSE = os.getenv('LLM_TIME_RESPONSE', 'false').lower() in ('1', 'true', 'yes')
+
+# Butler-style time replies, picked deterministically per location
+_TIME_RESPONSE_TEMPLATES = (
+    "The time in {location}, {user_address}, stands at {time_str}.",
+    "If I may, {user_address}, it is presently {time_str} in {location}.",
+    "In {location}, {user_address}, the clocks read {time_str}. Shall I prepare tea accordingly?",
+    "It is {time_str} in {location}, {user_address}. Punctual as ever, I trust.",
+    "{user_address}, the hour in {location} is {time_str}.",
+    "By my reckoning, {user_address}, it is {time_str} in {location}.",
+)
+
+# Context keys rendered separately from the generic key/value lines in ask()
+_SKIP_KEYS = frozenset({"user", "channel"})
+
+# Form of address when no Slack user is known
+_DEFAULT_ADDR = "sir"
+
+
+def _format_addr(context: Optional[Dict[str, Any]]) -> str:
+    """Form of address for the user in a request context"""
+    if context and 'user' in context:
+        return f"Master <@{context['user']}>"
+    return _DEFAULT_ADDR
+
+
+# Prompt templates, filled with str.format per request
+_ASK_TEMPLATE = """
+        Address the user as "{user_address}".
+        IMPORTANT: Keep responses CONCISE and to the point (100 words maximum).
+        Focus on answering the question directly first, then add brief characterization.
+        """
+_ASK_CONTEXT_TEMPLATE = "{instruction}\n\nContext: You are in the #{channel} channel.\n{context_str}"
+_QUERY_TEMPLATE = "{preamble}\n\nQuery: {query}"
+
+_TASK_DESCRIPTION_TEMPLATE = """
+        Create a comprehensive task description for the following task: "{task_name}"
+        Include:
+        - What needs to be done
+        - Potential first steps
+        - Key considerations
+        Keep it concise but informative, under 100 words.
+        
+        Write this description in your usual manner. Address the reader as "sir".
+        """
+
+_SUMMARY_TEMPLATE = """
+        Please summarize this conversation from the Slack channel #{channel_name}:
+        
+        {messages}
+        
+        Address the user as "{user_address}".
+        Provide a concise but comprehensive summary in your butler-like tone.
+        """
+
+_CONTEXTUAL_BASE_TEMPLATE = """
+        Address the user as "{user_address}".
+
+        IMPORTANT: Keep responses CONCISE (50-100 words maximum).
+        Focus on answering the question directly first, then add brief characterization.
+        """
+_CHANNEL_CONTEXT_TEMPLATE = """
+        CHANNEL CONTEXT:
+        You are in the #{name} channel.
+        Channel topic: {topic}
+        Channel purpose: {purpose}
+        Channel created: {created}
+        Channel members ({member_count}): {members}
+
+        When referencing users, use their proper names from the member list.
+        If asked about members, topic, purpose, etc., provide accurate information from the context.
+        """
+_THREAD_CONTEXT_TEMPLATE = """
+        You're replying in a thread conversation. Here's the recent conversation:
+        {thread}
+
+        The user specifically asked: "{query}"
+
+        If you're being asked about information in the thread, reference it directly.
+        Always respond politely, as if joining an ongoing conversation.
+        """
+_WORKFLOW_STATS_TEMPLATE = """
+        The user asked about workflows or deployments. Here are the actual statistics:
+        {ratio_info}
+
+        User query: {query}
+
+        Respond with the accurate statistics, formatted neatly. Don't make up numbers.
+        """
+# Workflow statistics answer written with placeholders, reusable for any numbers
+_WORKFLOW_STATS_SLOTS = ('user_address', 'total', 'success_count', 'failure_count', 'success_pct', 'failure_pct')
+_WORKFLOW_STATS_SLOT_PROMPT = """
+        Address the user as "{user_address}".
+
+        IMPORTANT: Keep responses CONCISE (50-100 words maximum).
+        The user asked about workflows or deployments. Here are the statistics, as placeholders:
+        - Deployment messages considered: {total}
+        - Successful deployments: {success_count} ({success_pct}%)
+        - Failed deployments: {failure_count} ({failure_pct}%)
+        - Success ratio: {success_count}:{failure_count}
+
+        Respond with the statistics, formatted neatly. Write every number and the form of
+        address exactly as the placeholders shown in curly braces (e.g. {success_count}),
+        never as actual values, and use no other curly braces.
+        """
+
+_HISTORY_TEMPLATE = """
+        Your recent conversation with this user (oldest first):
+{turns}
+
+        Continue the conversation naturally where relevant.
+        """
+_HISTORY_TURN_TEMPLATE = "        User: {}\n        Alfred: {}"
+_USER_QUERY_TEMPLATE = """
+        User query: {query}
+        """
+
+_TIME_TEMPLATE = """
+        The time in {location} is currently {time_str}.
+        Create a very brief, butler-like response telling {user_address} the time.
+        Keep it under 25 words, formal but slightly witty.
+        """
+
+class FallbackResponse(str):
+    """Apology text returned in place of a model response (not worth remembering or caching)"""
+
+
 class AIAssistant:
     def __init__(self, api_key: str):
         """
@@ -17,9 +195,135 @@ class AIAssistant:
             api_key (str): Google Gemini API key
         """
         self.api_key = api_key
-        genai.configure(api_key=api_key)
         model_name = os.getenv('GEMINI_MODEL', 'gemini-2.0-flash')
-        self.model = genai.GenerativeModel(model_name)
+        self.model_name = model_name
+        self._model = None
+        self._key_hasher = make_key_hasher(model_name, ALFRED_PERSONA)
+        self.response_cache = LLMCache.from_env()
+        self.shared_cache = RedisCache.from_env()
+        self.prompt_cache = PromptCache.from_env()
+        self.embedding_model = os.getenv('EMBEDDING_MODEL', 'models/text-embedding-004')
+        self.semantic_cache = SemanticCache.from_env(self._embed)
+        self.template_cache = TemplateCache()
+        # Last successful summary per channel ID as (user_address, summary), served
+        # only in the same channel when Gemini is unavailable
+        self.last_summaries: "OrderedDict[str, Tuple[str, str]]" = OrderedDict()
+        self._last_summaries_lock = threading.Lock()
+        self.rate_limiter = TokenBucket(
+            requests_per_minute=int(os.getenv('GEMINI_RPM', 60)),
+            tokens_per_minute=int(os.getenv('GEMINI_TPM', 120000))
+        )
+
+    @property
+    def model(self) -> genai.GenerativeModel:
+        """Gemini model, configured on first use rather than at construction"""
+        if self._model is None:
+            self._model = _get_model(self.api_key, self.model_name)
+        return self._model
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+        reraise=True
+    )
+    def _call_model(self, prompt: str) -> str:
+        """Call Gemini for a prompt, waiting and retrying on transient failures"""
+        self.rate_limiter.acquire(len(prompt) // 3 + RESPONSE_TOKEN_ESTIMATE)
+        return self.model.generate_content(prompt).text
+
+    def _cache_key(self, prompt: str) -> str:
+        """Cache key for a prompt (model name and persona are pre-hashed)"""
+        hasher = self._key_hasher.copy()
+        hasher.update(prompt.encode())
+        return hasher.hexdigest()
+
+    def _cached_response(self, key: str) -> Optional[str]:
+        """
+        Look a prompt key up in memory, then Redis, then SQLite, promoting hits
+        to the faster tiers
+        
+        Raises:
+            LookupError: On a miss while replaying (the model must not be called)
+        """
+        cached = self.response_cache.get(key)
+        if cached is not None:
+            return cached
+        if self.shared_cache:
+            cached = self.shared_cache.get(key)
+            if cached is not None:
+                self.response_cache.set(key, cached)
+                return cached
+        cached = self.prompt_cache.get(key)
+        if cached is not None:
+            self.response_cache.set(key, cached)
+            return cached
+        if self.prompt_cache.replaying:
+            raise LookupError("No cached response available to replay for this prompt")
+        return None
+
+    def _store_response(self, key: str, text: str) -> None:
+        """Store a fresh response in every cache tier"""
+        self.response_cache.set(key, text)
+        if self.shared_cache:
+            self.shared_cache.set(key, text)
+        self.prompt_cache.set(key, text)
+
+    def _stream_model(self, prompt: str, on_chunk: Callable[[str], None]) -> str:
+        """
+        Stream a Gemini response, reporting the text received so far after each chunk
+        
+        Args:
+            prompt (str): Fully rendered prompt
+            on_chunk (Callable): Called with the accumulated text after every chunk
+        
+        Returns:
+            str: The complete response text
+        """
+        self.rate_limiter.acquire(len(prompt) // 3 + RESPONSE_TOKEN_ESTIMATE)
+        parts = []
+        for chunk in self.model.generate_content(prompt, stream=True):
+            parts.append(chunk.text)
+            on_chunk("".join(parts))
+        return "".join(parts)
+
+    def _embed(self, text: str) -> List[float]:
+        """Embed a text for the semantic cache"""
+        # Resolving the model configures the SDK with this assistant's key
+        _ = self.model
+        return genai.embed_content(model=self.embedding_model, content=text)['embedding']
+
+    def _generate(self, prompt: str, semantic: Optional[Tuple[str, str]] = None,
+                  on_chunk: Optional[Callable[[str], None]] = None) -> str:
+        """
+        Generate a response, serving it from the cache tiers (memory, Redis,
+        SQLite, then semantic) when possible
+        
+        Args:
+            prompt (str): Fully rendered prompt
+            semantic (Tuple[str, str], optional): (prompt without the query, query) for
+                stateless prompts that may be answered from the semantic cache
+            on_chunk (Callable, optional): Stream a fresh response, reporting partial text
+        
+        Returns:
+            str: Cached or freshly generated response text
+        """
+        key = self._cache_key(prompt)
+        cached = self._cached_response(key)
+        if cached is not None:
+            return cached
+        
+        embedding = None
+        if semantic and self.semantic_cache:
+            namespace = self.model_name + semantic[0]
+            cached, embedding = self.semantic_cache.lookup(namespace, semantic[1])
+            if cached is not None:
+                return cached
+        
+        text = self._stream_model(prompt, on_chunk) if on_chunk else self._call_model(prompt)
+        self._store_response(key, text)
+        if embedding is not None:
+            self.semantic_cache.add(namespace, embedding, text)
+        return text
         
     def ask(self, query: str, context: Optional[Dict[str, Any]] = None) -> str:
         """
@@ -32,38 +336,26 @@ class AIAssistant:
         Returns:
             str: AI-generated response
         """
+        user_address = _format_addr(context)
         try:
-            # Extract user ID from context if available
-            user_address = f"Master <@{context.get('user')}>" if context and 'user' in context else "sir"
+            # Per-request instructions (the persona itself is the system instruction)
+            alfred_instruction = _ASK_TEMPLATE.format(user_address=user_address)
             
-            # Personality instructions for Alfred Pennyworth
-            alfred_instruction = f"""
-        Respond as Alfred Pennyworth from the Batman Arkham video game series. 
-        Use a formal, dignified, and slightly sardonic tone.
-        Address the user as "{user_address}".
-        Be helpful, wise, and occasionally witty, but always respectful.
-        Include subtle references to being a butler, as well as Batman comic book references, when appropriate.
-        IMPORTANT: Keep responses CONCISE and to the point (100 words maximum).
-        Focus on answering the question directly first, then add brief characterization.
-        """            
-            # Add context to the prompt if provided
+            # Add context to the prompt if provided (keys sorted so equal contexts share a cache key)
             if context:
                 channel = context.get("channel", "general channel")
-                context_str = "\n".join([f"{k}: {v}" for k, v in context.items() if k not in ["user", "channel"]])
-                prompt = f"{alfred_instruction}\n\nContext: You are in the #{channel} channel.\n{context_str}\n\nQuery: {query}"
+                context_str = "\n".join(f"{k}: {context[k]}" for k in sorted(context) if k not in _SKIP_KEYS)
+                preamble = _ASK_CONTEXT_TEMPLATE.format(instruction=alfred_instruction, channel=channel, context_str=context_str)
             else:
-                prompt = f"{alfred_instruction}\n\nQuery: {query}"
+                preamble = alfred_instruction
+            prompt = _QUERY_TEMPLATE.format(preamble=preamble, query=query)
             
-            # Generate response
-            response = self.model.generate_content(prompt)
-            
-            # Extract and return the text
-            return response.text
+            # Generate response (served from the prompt caches when possible)
+            return self._generate(prompt, semantic=(preamble, query))
             
         except Exception as e:
-            logging.error(f"AI generation error: {e}")
-            user_address = f"Master <@{context.get('user')}>" if context and 'user' in context else "sir"
-            return f"I'm terribly sorry, {user_address}. I encountered an error while processing your request. Perhaps we should try again when the Bat-Computer is functioning properly."
+            logger.error("AI generation error: %s", e, exc_info=True)
+            return FallbackResponse(f"I'm terribly sorry, {user_address}. I encountered an error while processing your request. Perhaps we should try again when the Bat-Computer is functioning properly.")
     
     def create_task_description(self, task_name: str) -> str:
         """
@@ -75,141 +367,194 @@ class AIAssistant:
         Returns:
             str: Generated task description
         """
-        prompt = f"""
-        Create a comprehensive task description for the following task: "{task_name}"
-        Include:
-        - What needs to be done
-        - Potential first steps
-        - Key considerations
-        Keep it concise but informative, under 100 words.
-        
-        Write this description in the style of Alfred Pennyworth from the Batman Arkham video game series:
-        formal, dignified, and slightly sardonic. Address the reader as "sir".
-        Include subtle butler references if appropriate.
-        """
+        prompt = _TASK_DESCRIPTION_TEMPLATE.format(task_name=task_name)
         
         try:
-            response = self.model.generate_content(prompt)
-            return response.text.strip()
+            return self._generate(prompt).strip()
         except Exception as e:
-            logging.error(f"Error creating task description: {e}")
+            logger.error("Error creating task description: %s", e, exc_info=True)
             return "No description available, sir. My apologies for the inconvenience. Perhaps this task is best discussed over tea."
 
+    def _map_concurrently(self, func: Callable[[Any], str], items: List[Any]) -> List[str]:
+        """Run func over items on the shared Gemini pool, preserving order"""
+        return list(_EXECUTOR.map(func, items))
+
     def summarize_conversation(self, context):
         """
         Generate a summary of a conversation.
         
         Args:
-            context (dict): Contains channel_name and messages
+            context (dict): Contains channel_name and messages, plus channel_id to
+                keep the summary as that channel's fallback
         
         Returns:
             str: Summary of the conversation
         """
-        # Determine if we have a specific user to address
-        user_address = "sir"  # Default address
-        if 'user' in context:
-            user_address = f"Master <@{context['user']}>"
+        prompt, user_address = self._summary_prompt(context)
+        channel_id = context.get('channel_id')
         
-        prompt = f"""
-        Please summarize this conversation from the Slack channel #{context['channel_name']}:
+        # Generate response (served from the prompt cache when possible)
+        try:
+            summary = self._generate(prompt)
+        except Exception as e:
+            logger.error("Error generating summary: %s", e, exc_info=True)
+            return self._summary_fallback(user_address, channel_id, context['channel_name'])
+        if channel_id:
+            with self._last_summaries_lock:
+                self.last_summaries[channel_id] = (user_address, summary)
+                self.last_summaries.move_to_end(channel_id)
+                while len(self.last_summaries) > LAST_SUMMARY_CHANNELS:
+                    self.last_summaries.popitem(last=False)
+        return summary
+
+    def _summary_prompt(self, context: Dict[str, Any]) -> Tuple[str, str]:
+        """Build the summary prompt and the form of address it uses"""
+        user_address = _format_addr(context)
         
-        {context['messages']}
+        # Keep the most recent text within the prompt budget
+        messages = context['messages']
+        if len(messages) > MAX_SUMMARY_CHARS:
+            messages = "…[truncated]…\n" + messages[-MAX_SUMMARY_CHARS:]
         
-        Respond as Alfred Pennyworth from the Batman Arkham video game series.
-        Use a formal, dignified, and slightly sardonic tone.
-        Address the user as "{user_address}".
-        Be helpful, wise, and occasionally witty, but always respectful.
-        Provide a concise but comprehensive summary in this butler-like tone.
-        Include subtle references to being a butler when appropriate.
+        prompt = _SUMMARY_TEMPLATE.format(
+            channel_name=context['channel_name'],
+            messages=messages,
+            user_address=user_address
+        )
+        return prompt, user_address
+
+    def _summary_fallback(self, user_address: str, channel_id: Optional[str] = None,
+                          channel_name: Optional[str] = None) -> str:
+        """Apology returned when a summary cannot be generated, with the same channel's last summary if any"""
+        with self._last_summaries_lock:
+            stored = self.last_summaries.get(channel_id) if channel_id else None
+        if stored:
+            # Re-address a summary prepared for someone else to whoever is asking now
+            # (the generic address is left alone; "sir" also matches inside words)
+            original_address, last_summary = stored
+            if original_address != _DEFAULT_ADDR:
+                last_summary = last_summary.replace(original_address, user_address)
+            return f"I'm terribly sorry, {user_address}. I couldn't reach my usual faculties just now, but here is the last summary I prepared for #{channel_name}:\n\n{last_summary}"
+        return f"I'm terribly sorry, {user_address}. I couldn't summarize the conversation at this time. Perhaps the topic was too complex for my humble understanding. Shall I prepare some tea while you review it yourself?"
+
+    def batch_summarize(self, contexts: List[Dict[str, Any]]) -> List[str]:
         """
+        Summarize several conversations concurrently (for non-interactive digests)
         
-        # Generate response from Gemini
-        try:
-            response = self.model.generate_content(prompt)
-            return response.text
-        except Exception as e:
-            logging.error(f"Error generating summary: {e}")
-            return f"I'm terribly sorry, {user_address}. I couldn't summarize the conversation at this time. Perhaps the topic was too complex for my humble understanding. Shall I prepare some tea while you review it yourself?"
+        Args:
+            contexts (List[Dict]): Contexts as accepted by summarize_conversation
+        
+        Returns:
+            List[str]: Summaries in the same order as contexts
+        """
+        return self._map_concurrently(self.summarize_conversation, contexts)
 
     def get_contextual_response(self, query: str, user_address: str, 
-                            thread_context: Optional[List[str]] = None, 
+                            thread_context: Optional[Iterable[str]] = None, 
                             workflow_stats: Optional[Dict[str, Any]] = None,
-                            channel_data: Optional[Dict[str, Any]] = None) -> str:
+                            channel_data: Optional[Dict[str, Any]] = None,
+                            history: Optional[Sequence[Tuple[str, str]]] = None,
+                            on_chunk: Optional[Callable[[str], None]] = None) -> str:
         """
         Generate a response with additional context awareness
         
         Args:
             query (str): User's question or command
             user_address (str): How to address the user
-            thread_context (List[str], optional): Messages from a thread
+            thread_context (Iterable[str], optional): Up to THREAD_CONTEXT_MESSAGES recent thread messages
             workflow_stats (Dict, optional): Statistics about workflows/deployments
             channel_data (Dict, optional): Channel information including members, topic, etc.
+            history (Sequence[Tuple[str, str]], optional): Earlier (query, response) turns with this user
+            on_chunk (Callable, optional): Stream the response, called with the text so far
             
         Returns:
-            str: AI-generated response
+            str: AI-generated response, or a FallbackResponse apology if generation failed
         """
         try:
-            # Base Alfred prompt with brevity instruction
-            alfred_prompt = f"""
-        You are Alfred Pennyworth from the Batman Arkham video game series.
-        Use a formal, dignified, and slightly sardonic tone.
-        Address the user as "{user_address}".
-        Be helpful, wise, and occasionally witty, but always respectful.
-        Include subtle references to being a butler when appropriate.
+            # Statistics answers are reusable as templates when no other context applies
+            if workflow_stats and 'success_count' in workflow_stats and not (channel_data or thread_context or history):
+                response = self._workflow_stats_response(query, user_address, workflow_stats)
+                if response is not None:
+                    return response
 
-        IMPORTANT: Keep responses CONCISE (50-100 words maximum).
-        Focus on answering the question directly first, then add brief characterization.
-        """
+            # Base prompt with brevity instruction (the persona is the system instruction)
+            parts = [_CONTEXTUAL_BASE_TEMPLATE.format(user_address=user_address)]
 
             # Add channel data if provided
             if channel_data:
-                members_str = ", ".join(channel_data.get("members_formatted", ["No members found"]))
-                alfred_prompt += f"""
-        CHANNEL CONTEXT:
-        You are in the #{channel_data['name']} channel.
-        Channel topic: {channel_data.get('topic', 'No topic set')}
-        Channel purpose: {channel_data.get('purpose', 'No purpose set')}
-        Channel created: {channel_data.get('created', 'Unknown date')}
-        Channel members ({channel_data.get('member_count', 0)}): {members_str}
-
-        When referencing users, use their proper names from the member list.
-        If asked about members, topic, purpose, etc., provide accurate information from the context.
-        """
+                parts.append(_CHANNEL_CONTEXT_TEMPLATE.format(
+                    name=channel_data['name'],
+                    topic=channel_data.get('topic', 'No topic set'),
+                    purpose=channel_data.get('purpose', 'No purpose set'),
+                    created=channel_data.get('created', 'Unknown date'),
+                    member_count=channel_data.get('member_count', 0),
+                    members=", ".join(channel_data.get("members_formatted", ["No members found"]))
+                ))
 
             # Add thread context if provided
-            elif thread_context and len(thread_context) > 0:
-                alfred_prompt += f"""
-        You're replying in a thread conversation. Here's the recent conversation:
-        {chr(10).join(thread_context[-8:])}
-
-        The user specifically asked: "{query}"
-
-        If you're being asked about information in the thread, reference it directly.
-        Always respond politely, as if joining an ongoing conversation.
-        """
+            elif thread_context:
+                parts.append(_THREAD_CONTEXT_TEMPLATE.format(thread="\n".join(thread_context), query=query))
             # Add workflow statistics if provided
             elif workflow_stats:
-                alfred_prompt += f"""
-        The user asked about workflows or deployments. Here are the actual statistics:
-        {workflow_stats['ratio_info']}
+                parts.append(_WORKFLOW_STATS_TEMPLATE.format(ratio_info=workflow_stats['ratio_info'], query=query))
+            
+            # Add earlier turns of this user's conversation if provided
+            if history:
+                turns = "\n".join(_HISTORY_TURN_TEMPLATE.format(q, r) for q, r in history)
+                parts.append(_HISTORY_TEMPLATE.format(turns=turns))
 
-        User query: {query}
+            # Paraphrases may share a response unless the prompt carries the query
+            # or conversation state
+            semantic = None
+            if not (thread_context or workflow_stats or history):
+                semantic = ("".join(parts), query)
 
-        Respond with the accurate statistics, formatted neatly. Don't make up numbers.
-        """
-            
             # Always add the query at the end
-            alfred_prompt += f"""
-        User query: {query}
-        """
+            parts.append(_USER_QUERY_TEMPLATE.format(query=query))
+            alfred_prompt = "".join(parts)
             
-            # Generate response
-            response = self.model.generate_content(alfred_prompt)
-            return response.text
+            # Generate response (served from the prompt caches when possible)
+            return self._generate(alfred_prompt, semantic=semantic, on_chunk=on_chunk)
             
         except Exception as e:
-            logging.error(f"AI generation error: {e}")
-            return f"I'm terribly sorry, {user_address}. I encountered an error while processing your request. Perhaps we should try again when the Bat-Computer is functioning properly."
+            logger.error("AI generation error: %s", e, exc_info=True)
+            return FallbackResponse(f"I'm terribly sorry, {user_address}. I encountered an error while processing your request. Perhaps we should try again when the Bat-Computer is functioning properly.")
+
+    def _workflow_stats_response(self, query: str, user_address: str,
+                                 workflow_stats: Dict[str, Any]) -> Optional[str]:
+        """
+        Answer a workflow statistics query by filling a response template
+        
+        The first query of a given shape asks Gemini for an answer written with
+        placeholders; later queries of the same shape only format that template.
+        
+        Args:
+            query (str): User's question
+            user_address (str): How to address the user
+            workflow_stats (Dict): Counts and percentages named as in _WORKFLOW_STATS_SLOTS
+            
+        Returns:
+            str: The filled-in response, or None if no usable template could be made
+        """
+        values = {slot: workflow_stats.get(slot) for slot in _WORKFLOW_STATS_SLOTS}
+        values['user_address'] = user_address
+        
+        template = self.template_cache.get(query)
+        if template is None:
+            prompt = _WORKFLOW_STATS_SLOT_PROMPT + f"""
+        User query: {query}
+        """
+            template = self._generate(prompt).strip()
+            try:
+                template.format(**values)
+            except (KeyError, IndexError, ValueError):
+                logger.warning("Workflow statistics answer was not a usable template; answering directly")
+                return None
+            if '{' not in template:
+                return None
+            self.template_cache.set(query, template)
+        
+        return template.format(**values)
 
     def get_time_response(self, location: str, time_str: str, user_address: str) -> str:
         """
@@ -221,17 +566,15 @@ class AIAssistant:
             user_address (str): How to address the user
         
         Returns:
-            str: AI-generated response about the time
-        """
-        prompt = f"""
-        You are Alfred Pennyworth from Batman.
-        The time in {location} is currently {time_str}.
-        Create a very brief, butler-like response telling {user_address} the time.
-        Keep it under 25 words, formal but slightly witty.
+            str: Response about the time (from a template unless LLM_TIME_RESPONSE is set)
         """
+        if not LLM_TIME_RESPONSE:
+            template = _TIME_RESPONSE_TEMPLATES[zlib.crc32(location.encode()) % len(_TIME_RESPONSE_TEMPLATES)]
+            return template.format(location=location, time_str=time_str, user_address=user_address)
+        
+        prompt = _TIME_TEMPLATE.format(location=location, time_str=time_str, user_address=user_address)
         try:
-            response = self.model.generate_content(prompt)
-            return response.text.strip()
+            return self._generate(prompt).strip()
         except Exception as e:
-            logging.error(f"Error generating time response: {e}")
+            logger.error("Error generating time response: %s", e, exc_info=True)
             return f"The time in {location} is currently {time_str}, {user_address}."
\ No newline at end of file
@@ -5,72 +5,436 @@ Pennyworth Bot - Core Bot Implementation
 import os
 import logging
 import random
-import datetime
 import pytz
 import re
 from slack_bolt import App
 from slack_bolt.adapter.socket_mode import SocketModeHandler
-import google.generativeai as genai
 from dotenv import load_dotenv
-from src.ai_assistant import AIAssistant
+from src.log_config import configure_logging
+from src.ai_assistant import AIAssistant, FallbackResponse, THREAD_CONTEXT_MESSAGES
 from src.trello_workflows import TrelloWorkflow
+from src.utils import create_http_session, create_section_block
+from src.rate_limit import TokenBucket, RateLimitedWebClient
 from datetime import datetime
 from typing import Optional, Dict, Any, Callable, List
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from slack_sdk.errors import SlackApiError
+from tenacity import retry, stop_after_attempt, stop_after_delay, wait_random_exponential, retry_if_exception
 import threading
 import schedule
 import time
+import functools
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 
 # Configure logging
-logging.basicConfig(
-    level=os.getenv('LOG_LEVEL', 'INFO'),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S'
-)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 # Load environment variables
 load_dotenv()
 
-# Gemini AI Configuration
-genai.configure(api_key=os.getenv('GOOGLE_GEMINI_API_KEY'))
+# Channel configuration, read once at import
+GALLEY_CHANNEL = os.getenv('GALLEY_CHANNEL')
+UXOPS_CHANNEL = os.getenv('UXOPS_CHANNEL')
+AFROTAKU_CHANNEL = os.getenv('AFROTAKU_CHANNEL')
+# Contact email shown on the bot's profile
+SERVICE_EMAIL = os.getenv('SERVICE_EMAIL')
+
+# Quiet period (seconds) before queued announcements are posted as one message
+ANNOUNCEMENT_DEBOUNCE_SECONDS = float(os.getenv('ANNOUNCEMENT_DEBOUNCE_SECONDS', 1.5))
+# Slack allows at most 50 blocks per message
+MAX_BLOCKS_PER_MESSAGE = 50
+
+# Worker threads running Slack listeners once Bolt has acked the event
+LISTENER_WORKERS = int(os.getenv('LISTENER_WORKERS', 16))
+# Threads the Socket Mode client uses to process incoming WebSocket frames
+SOCKET_MODE_CONCURRENCY = int(os.getenv('SOCKET_MODE_CONCURRENCY', 16))
+# Parallel Socket Mode connections (Slack allows up to 10 per app)
+SOCKET_CONNECTIONS = max(1, min(10, int(os.getenv('SOCKET_CONNECTIONS', 2))))
+# Seconds between Socket Mode keepalive pings
+SOCKET_PING_INTERVAL = int(os.getenv('SOCKET_PING_INTERVAL', 30))
+
+# Seconds the workspace name from team_info is reused
+WORKSPACE_NAME_TTL = 86400
+
+# Small pool for independent Slack calls (e.g. per-project welcomes, overlapped lookups)
+_POST_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="slack-post")
+
+# Hours between scheduled flushes of the !digest queue
+DIGEST_INTERVAL_HOURS = int(os.getenv('DIGEST_INTERVAL_HOURS', 24))
+
+# Earlier (query, response) turns kept per user and channel for AI conversations
+AI_HISTORY_TURNS = 10
+# Conversations remembered at once (least recently used are dropped) and idle seconds before one is forgotten
+AI_HISTORY_MAX_CONVERSATIONS = int(os.getenv('AI_HISTORY_MAX_CONVERSATIONS', 1000))
+AI_HISTORY_TTL = int(os.getenv('AI_HISTORY_TTL', 3600))
+
+# Stream standard AI replies into a placeholder message, edited at most once per interval
+AI_STREAM_RESPONSES = os.getenv('AI_STREAM_RESPONSES', 'false').lower() in ('1', 'true', 'yes')
+STREAM_UPDATE_INTERVAL = float(os.getenv('STREAM_UPDATE_INTERVAL', 1.0))
+_STREAM_PLACEHOLDER = "_One moment, if you please..._ 🎩"
+
+# Seconds a cached users_info profile stays fresh
+USER_CACHE_TTL = int(os.getenv('USER_CACHE_TTL', 1800))
+# Seconds a failed users_info lookup is remembered before Slack is asked again
+USER_FAILURE_TTL = int(os.getenv('USER_FAILURE_TTL', 60))
+# Attempts for Slack calls that hit transient errors (see _slack_call)
+SLACK_CALL_ATTEMPTS = int(os.getenv('SLACK_CALL_ATTEMPTS', 8))
+# Seconds an interactive Slack call may spend retrying before the user gets an answer
+SLACK_CALL_MAX_DELAY = float(os.getenv('SLACK_CALL_MAX_DELAY', 10))
+# Retry budget for background calls (e.g. scheduled digests)
+SLACK_BACKGROUND_MAX_DELAY = 120
+# Slack error codes worth retrying; rate limits (429/ratelimited) are left to the
+# client's RateLimitErrorRetryHandler so they are only retried in one layer
+_TRANSIENT_SLACK_ERRORS = frozenset(('service_unavailable', 'internal_error', 'fatal_error', 'request_timeout'))
+
+def _is_transient_slack_error(exc):
+    """True for network errors and 5xx Slack API responses (not rate limits)"""
+    if isinstance(exc, (ConnectionError, TimeoutError)):
+        return True
+    if isinstance(exc, SlackApiError):
+        status = getattr(exc.response, 'status_code', 0)
+        return status >= 500 or exc.response.get('error') in _TRANSIENT_SLACK_ERRORS
+    return False
+
+# Messages fetched (and summarized) for !summarize and digests
+SUMMARY_HISTORY_LIMIT = 20
+# Seconds a conversations_info channel name is reused, and how many are kept
+CHANNEL_NAME_TTL = int(os.getenv('CHANNEL_NAME_TTL', 600))
+CHANNEL_NAME_CACHE_SIZE = 1024
+# Seconds a channel's deployment statistics are reused between queries
+DEPLOYMENT_STATS_TTL = int(os.getenv('DEPLOYMENT_STATS_TTL', 30))
+
+# Workspace timezone name, read once at import
+TIMEZONE = os.getenv('TIMEZONE', 'America/New_York')
+
+@functools.lru_cache(maxsize=None)
+def _tz(name):
+    """Return the pytz timezone for a name, resolved once per name"""
+    return pytz.timezone(name)
+
+# Workspace timezone, resolved once at import
+_TZ = _tz(TIMEZONE)
+
+# Command patterns, compiled once at import (ASCII-only classes; commands are ASCII)
+_AI_RE = re.compile(r"^!ai\s+(.+)", re.ASCII)
+_TRELLO_RE = re.compile(r"^!trello\s+(.+)", re.ASCII)
+_DIGEST_RE = re.compile(r"^!digest", re.ASCII)
+_SUMMARIZE_RE = re.compile(r"^!summarize", re.ASCII)
+
+# Message content patterns, compiled once at import
+_MENTION_RE = re.compile(r"<@[A-Z0-9]+>\s*", re.ASCII)
+_TIME_RE = re.compile(r"what(?:'s| is) (?:the )?time(?: in | at )([a-zA-Z\s]+)\??")
+# Channel-info questions, combined into one alternation so a query is scanned once
+_CHANNEL_INFO_RE = re.compile("|".join(f"(?:{pattern})" for pattern in (
+    r"(?:who|what|list|tell).+(?:members|users|people|participants)",
+    r"(?:who).+(?:in|part of).+(?:channel|here|this)",
+    r"(?:tell|show).+(?:about|info|information).+(?:channel|here)",
+    r"(?:what).+(?:channel|topic|purpose)"
+)))
+# Workflow/deployment statistics questions
+_WORKFLOW_RE = re.compile(r"workflow|deployment|ratio|success")
+
+# Static message templates, formatted once per event
+_WELCOME_TEMPLATE = (
+    "Good day, {user_address}. Welcome aboard {workspace_name}. 🎩\n\n"
+    "I'm Pennyworth, your AI butler. Allow me to assist with your orientation:\n"
+    "• The study contains our documentation and project resources\n"
+    "• The #galley channel hosts our common area for all manner of discourse\n"
+    "• Your quarters await your personal profile setup\n\n"
+    "Should you require anything, simply summon me with `!ai [your question]` or engage with me via the *Apps* directory below."
+)
+
+_GALLEY_ANNOUNCEMENT_TEMPLATE = (
+    "*Announcing a new arrival* 🎩\n\n"
+    "May I present {user_address}, who has just joined our distinguished company.\n\n"
+    "*For those unfamiliar with my services:*\n"
+    "• Summon my assistance with `!ai [your question]` for information, guidance, or witty banter\n"
+    "• Request `!summarize` in any channel for a concise briefing of recent discussions\n"
+    "• React to messages with emoji reactions that I shall dutifully mirror\n"
+    "• Create reminders that I shall manage with utmost attention to detail\n"
+    "• Engage me in direct messages for more private inquiries\n\n"
+    "A full catalogue of my capabilities is available via the <https://app.slack.com/app-settings/T08DSA45NDV/A08E8UZSGK9|Slack App Directory>.\n\n"
+    "I shall be attending to {user_address}'s orientation. Do make them feel welcome.\n"
+    "As always, I remain at your service in all channels. Simply call when needed."
+)
+
+_UXOPS_WELCOME_TEMPLATE = (
+    "*Welcome to #project-ux-ops*, {user_address} 🎩\n\n"
+    "This channel is dedicated to our UX Operations initiatives. Allow me to acquaint you with the resources at your disposal:\n\n"
+    "• *Project Overview*: <https://app.slack.com/canvas/C12345|UX Ops Project Canvas>\n"
+    "• *Task Management*: <https://trello.com/b/abcdef|UX Ops Trello Board>\n\n"
+    "I'm configured to assist with your Trello workflows in this channel:\n"
+    "• `!trello create [card title]` - Create a new task card\n"
+    "• `!trello lists` - View all task categories\n"
+    "• `!trello boards` - View connected project boards\n\n"
+    "Should you require anything else, I remain at your service."
+)
+
+_AFROTAKU_WELCOME_TEMPLATE = (
+    "*Welcome to #afrotaku*, {user_address} 🎩\n\n"
+    "This channel is dedicated to our Afrotaku creative initiatives. Allow me to present the resources at your disposal:\n\n"
+    "• *Project Overview*: <https://app.slack.com/canvas/C67890|Afrotaku Project Canvas>\n"
+    "• *Task Management*: <https://trello.com/b/ghijkl|Afrotaku Trello Board>\n\n"
+    "I've been programmed to assist with your Trello workflows in this channel:\n"
+    "• `!trello create [card title]` - Create a new task card\n"
+    "• `!trello lists` - View all task categories\n"
+    "• `!trello boards` - View connected project boards\n\n"
+    "Should you wish to link conversations to tasks, simply use `!trello comment [card ID] [your comment]`\n\n"
+    "As with all project channels, I can provide summaries of discussions with `!summarize`.\n\n"
+    "I shall endeavor to make your creative process as seamless as possible."
+)
+
+_HELLO_TEMPLATES = (
+    "{greeting}, {user_address}. How might I be of service today?",
+    "{greeting}, {user_address}. I trust you're well. Is there anything you require?",
+    "{greeting}, {user_address}. Always a pleasure to be of assistance.",
+    "{greeting}, {user_address}. I've prepared your digital workspace. What shall we accomplish today?",
+)
+_MORNING_HELLO_TEMPLATES = (
+    "{greeting}, {user_address}. I've prepared your usual breakfast: toast :bread:, coffee :coffee:, bandages :adhesive_bandage:.",
+)
+_EVENING_HELLO_TEMPLATES = (
+    "{greeting}, {user_address}. Dare we hope that Gotham treats you to an early evening? :bat:",
+)
+# Full hello pool per greeting: the common replies plus any time-specific extras
+_HELLO_POOLS = {
+    "Good morning": _HELLO_TEMPLATES + _MORNING_HELLO_TEMPLATES,
+    "Good evening": _HELLO_TEMPLATES + _EVENING_HELLO_TEMPLATES,
+    "Good night": _HELLO_TEMPLATES + _EVENING_HELLO_TEMPLATES,
+}
+
+_TRELLO_HELP_TEMPLATE = (
+    "*Trello Commands*, {user_address}:\n"
+    "• `!trello create [card title] in [list name]` - Create a new task card\n"
+    "• `!trello move [card ID] to [list name]` - Move a card to another list\n"
+    "• `!trello comment [card ID] [comment text]` - Add a comment to a card\n"
+    "• `!trello boards` - List available boards\n"
+    "• `!trello lists [board name]` - List the lists in a specific board\n"
+)
+
+_EMPTY_MENTION_TEMPLATES = (
+    "You rang, {user_address}? How may I be of assistance?",
+    "At your service, {user_address}. How might I help?",
+    "{user_address}, I'm attending. What do you require?",
+)
+
+_ALFRED_RESPONSE_TEMPLATES = {
+    "general": (
+        "How may I be of service, {user_address}?",
+        "At your disposal, {user_address}.",
+        "As you wish, {user_address}.",
+    ),
+    "error": (
+        "My sincerest apologies, {user_address}. There seems to be a technical issue.",
+        "I've encountered an error, {user_address}. Perhaps the Bat-Computer needs maintenance.",
+        "Regrettably, I've hit a snag, {user_address}. Shall I prepare some tea while we troubleshoot?",
+    ),
+    "success": (
+        "Task completed, {user_address}. Will there be anything else?",
+        "It's been taken care of, {user_address}.",
+        "Consider it done, {user_address}. Your digital affairs are in order.",
+    ),
+    "greeting": (
+        "Good day, {user_address}. How might I assist you today?",
+        "Welcome, {user_address}. The digital manor is prepared for your arrival.",
+        "{user_address}. A pleasure as always. What services do you require today?",
+    ),
+}
+
+def _alfred_response(user_address, category="general"):
+    """Pick an Alfred-style response for a category, addressed to the user"""
+    templates = _ALFRED_RESPONSE_TEMPLATES.get(category) or _ALFRED_RESPONSE_TEMPLATES["general"]
+    return random.choice(templates).format(user_address=user_address)
+
+# Common city/region names mapped to timezone strings
+_COMMON_LOCATIONS = {
+    'new york': 'America/New_York',
+    'nyc': 'America/New_York',
+    'chicago': 'America/Chicago',
+    'la': 'America/Los_Angeles',
+    'alaska': 'America/Anchorage',
+    'hawaii': 'Pacific/Honolulu',
+    'london': 'Europe/London',
+    'uk': 'Europe/London',
+    'france': 'Europe/Paris',
+    'germany': 'Europe/Berlin',
+    'italy': 'Europe/Rome',
+    'turkey': 'Europe/Istanbul',
+    'japan': 'Asia/Tokyo',
+    'tokyo': 'Asia/Tokyo',
+    'korea': 'Asia/Seoul',
+    'china': 'Asia/Shanghai',
+    'india': 'Asia/Kolkata',
+    'sydney': 'Australia/Sydney',
+    'pacific': 'America/Los_Angeles',
+    'eastern': 'America/New_York',
+    'central': 'America/Chicago',
+    'mountain': 'America/Denver'
+}
+
+# Lowercased common timezone names mapped to their canonical form, built once
+_TZ_LOWER_TO_CANON = {tz.lower(): tz for tz in pytz.common_timezones}
+
+@functools.lru_cache(maxsize=256)
+def _resolve_timezone_name(location):
+    """
+    Resolve a lowercased location to a timezone name
+    
+    Args:
+        location: Lowercased, stripped city/region or timezone name
+        
+    Returns:
+        Canonical timezone name, or None if nothing matches
+    """
+    if location in _COMMON_LOCATIONS:
+        return _COMMON_LOCATIONS[location]
+    canon = _TZ_LOWER_TO_CANON.get(location)
+    if canon:
+        return canon
+    # Partial matching for country/region
+    return next((tz for low, tz in _TZ_LOWER_TO_CANON.items() if location in low), None)
+
+# Honorifics (with or without a trailing period) skipped when picking a first name from a real name
+_HONORIFIC_RE = re.compile(r"(?:mr|ms|mrs|dr|prof|sir|madam|miss|lord|lady|rev)\.?", re.IGNORECASE)
+
+# Greeting for each hour of the day (0-23)
+_HOUR_TO_GREETING = (
+    ("Good night",) * 5 +       # 00:00-04:59
+    ("Good morning",) * 7 +     # 05:00-11:59
+    ("Good afternoon",) * 5 +   # 12:00-16:59
+    ("Good evening",) * 5 +     # 17:00-21:59
+    ("Good night",) * 2         # 22:00-23:59
+)
 
 class PennyworthBot:
     def __init__(self):
-        # Slack Bot initialization
+        # Slack Bot initialization - events are acked immediately and the
+        # listeners (Gemini, Trello, Slack lookups) run on a dedicated pool
+        self.listener_executor = ThreadPoolExecutor(
+            max_workers=LISTENER_WORKERS,
+            thread_name_prefix="pennyworth-listener"
+        )
         self.slack_app = App(
-            token=os.getenv('SLACK_BOT_TOKEN'),
-            signing_secret=os.getenv('SLACK_SIGNING_SECRET')
+            client=RateLimitedWebClient(token=os.getenv('SLACK_BOT_TOKEN')),
+            signing_secret=os.getenv('SLACK_SIGNING_SECRET'),
+            process_before_response=False,
+            listener_executor=self.listener_executor
         )
 
+        # users_info cache (user_id -> (expiry, user_info, user_address))
+        self._user_profile_cache = {}
+        self._user_profile_lock = threading.Lock()
+
+        # Deployment statistics per channel (channel_id -> (expiry, stats or None))
+        self._deployment_stats_cache = {}
+        self._deployment_stats_lock = threading.Lock()
+
+        # conversations_info channel names (channel_id -> (expiry, name))
+        self._channel_name_cache = {}
+        self._channel_name_lock = threading.Lock()
+
+        # Cached auth_test bot user ID (stable for the token's lifetime)
+        self._bot_user_id = None
+
+        # Cached team_info workspace name
+        self._workspace_name = None
+        self._workspace_name_expiry = 0.0
+
+        # AI conversation history, least recently used first
+        # ((user_id, channel_id) -> (expiry, deque of (query, response)))
+        self._ai_histories = OrderedDict()
+        self._ai_history_lock = threading.Lock()
+
+        # Channels queued for the next scheduled digest (channel_id -> requesting user_id)
+        self._digest_queue = {}
+        self._digest_lock = threading.Lock()
+
+        # Announcements awaiting a batched post (channel_id -> [text])
+        self._pending_announcements = {}
+        self._announcement_timers = {}
+        self._announcement_lock = threading.Lock()
+
         self.update_bot_profile()
 
         # Gemini AI model - use environment variable with default fallback
         self.ai_assistant = AIAssistant(os.getenv('GOOGLE_GEMINI_API_KEY'))
 
+        # Pooled keep-alive HTTP session shared by outbound REST clients
+        self.http_session = create_http_session()
+
         # Trello client
         self.trello_workflow = TrelloWorkflow(
             api_key=os.getenv('TRELLO_API_KEY'),
             api_secret=os.getenv('TRELLO_API_SECRET'),
             token=os.getenv('TRELLO_TOKEN'),
-            ai_generator=self.create_task_description
+            ai_generator=self.create_task_description,
+            session=self.http_session,
+            rate_limiter=TokenBucket(requests_per_minute=int(os.getenv('TRELLO_RPM', 100)))
         )
 
+        # !trello subcommand dispatch table
+        self._trello_handlers = {
+            "create": self._trello_create,
+            "boards": self._trello_boards,
+            "lists": self._trello_lists,
+            "comment": self._trello_comment,
+            "move": self._trello_move,
+        }
+
         # Register Event Handlers
         self._register_handlers()
         logger.info("Pennyworth Bot initialized successfully")
 
+    def get_channel_name(self, channel_id, default="this conversation"):
+        """
+        Get a channel's name, cached per channel ID for CHANNEL_NAME_TTL seconds
+        
+        Args:
+            channel_id: The Slack channel ID
+            default: Name used when the channel has none (e.g. DMs)
+            
+        Returns:
+            The channel name
+        """
+        now = time.monotonic()
+        with self._channel_name_lock:
+            cached = self._channel_name_cache.get(channel_id)
+        if cached and now < cached[0]:
+            return cached[1] or default
+
+        channel_info = self._slack_call(
+            self.slack_app.client.conversations_info, channel=channel_id
+        )["channel"]
+        self._cache_channel_name(channel_id, channel_info.get('name'), now)
+        return channel_info.get('name') or default
+
+    def _cache_channel_name(self, channel_id, name, now=None):
+        """Store a channel name, evicting the oldest entry once the cache is full"""
+        now = time.monotonic() if now is None else now
+        with self._channel_name_lock:
+            if channel_id not in self._channel_name_cache and len(self._channel_name_cache) >= CHANNEL_NAME_CACHE_SIZE:
+                # Dicts keep insertion order, so the first key is the oldest
+                del self._channel_name_cache[next(iter(self._channel_name_cache))]
+            self._channel_name_cache[channel_id] = (now + CHANNEL_NAME_TTL, name)
+
+    def get_bot_user_id(self):
+        """Get the bot's own user ID, fetched with auth_test once"""
+        if self._bot_user_id is None:
+            self._bot_user_id = self.slack_app.client.auth_test()["user_id"]
+        return self._bot_user_id
+
     def update_bot_profile(self):
         """Update Pennyworth bot's profile settings"""
         try:
-            bot_user_id = self.slack_app.client.auth_test()["user_id"]
+            bot_user_id = self.get_bot_user_id()
 
             profile_info = {
                 "display_name": "Pennyworth",
                 "status_text": "At your service",
                 "status_emoji": ":robot_face:",
-                "tz": os.getenv('TIMEZONE', 'America/New_York'),
-                "email": os.getenv('SERVICE_EMAIL')
+                "tz": TIMEZONE,
+                "email": SERVICE_EMAIL
             }
 
             self.slack_app.client.users_profile_set(
@@ -81,27 +445,38 @@ class PennyworthBot:
             logger.info("Pennyworth bot profile updated successfully")
 
         except Exception as e:
-            logger.error(f"Error updating Pennyworth bot profile: {e}")
+            logger.error("Error updating Pennyworth bot profile: %s", e)
 
-    def with_retry(self, func, max_attempts=3):
+    def _slack_call(self, method, max_delay=SLACK_CALL_MAX_DELAY, **kwargs):
         """
-        Apply retry logic to a function that makes API calls
+        Call a Slack client method, retrying transient failures with jittered
+        exponential backoff (up to SLACK_CALL_ATTEMPTS attempts within max_delay seconds)
+        
+        Permanent errors (e.g. channel_not_found) are raised immediately rather
+        than retried, and rate limits are retried by the client itself. Backoff
+        sleeps are clamped to what is left of max_delay, so no retry starts after it.
         
         Args:
-            func: Function to retry
-            max_attempts: Maximum number of retry attempts
+            method: Bound Slack client method, e.g. self.slack_app.client.conversations_history
+            max_delay: Seconds after which no further attempt is made
+            **kwargs: Arguments for the method
             
         Returns:
-            Function result after successful execution
+            The Slack API response
         """
+        backoff = wait_random_exponential(multiplier=0.5, max=max_delay)
+
+        def wait_within_budget(retry_state):
+            return min(backoff(retry_state), max(0.0, max_delay - retry_state.seconds_since_start))
+
         @retry(
-            stop=stop_after_attempt(max_attempts),
-            wait=wait_exponential(multiplier=1, min=2, max=10),
-            retry=retry_if_exception_type((ConnectionError, TimeoutError, Exception)),
+            stop=stop_after_attempt(SLACK_CALL_ATTEMPTS) | stop_after_delay(max_delay),
+            wait=wait_within_budget,
+            retry=retry_if_exception(_is_transient_slack_error),
             reraise=True
         )
         def wrapper():
-            return func()
+            return method(**kwargs)
         
         return wrapper()
 
@@ -110,18 +485,7 @@ class PennyworthBot:
         Return a greeting based on the time of day.
         'time_zone' is set via environment variable TIMEZONE.
         """
-        time_zone = pytz.timezone(os.getenv('TIMEZONE', 'America/New_York'))
-        current_time = datetime.datetime.now(time_zone)
-        hour = current_time.hour
-        
-        if 5 <= hour < 12:
-            return "Good morning"
-        elif 12 <= hour < 17:
-            return "Good afternoon"
-        elif 17 <= hour < 22:
-            return "Good evening"
-        else:
-            return "Good night"
+        return _HOUR_TO_GREETING[datetime.now(_TZ).hour]
 
     def get_preferred_name(self, user_info):
         """
@@ -146,178 +510,467 @@ class PennyworthBot:
         real_name = real_name.strip()
         
         # If no spaces, use the whole name
-        if ' ' not in real_name:
+        first_name, _, remainder = real_name.partition(' ')
+        if not remainder:
             return real_name
         
-        # Split by spaces to get parts
-        name_parts = real_name.split()
-        
         # Check for honorifics to skip
-        honorifics = ['mr', 'ms', 'mrs', 'dr', 'prof', 'sir', 'madam', 'miss', 'lord', 'lady', 'rev']
-        if name_parts[0].lower().rstrip('.') in honorifics and len(name_parts) > 1:
+        if _HONORIFIC_RE.fullmatch(first_name):
             # Skip the honorific and use the next part
-            return name_parts[1]
+            return remainder.split(None, 1)[0]
         else:
             # Otherwise use the first part
-            return name_parts[0]
+            return first_name
+
+    def _lookup_user(self, user_id):
+        """
+        Get a user's Slack info and form of address, cached per user ID for
+        USER_CACHE_TTL seconds
+        
+        Args:
+            user_id: The Slack user ID
+            
+        Returns:
+            Tuple of (user object from users_info, formatted address); the user
+            object is None if the lookup failed within the last USER_FAILURE_TTL seconds
+        """
+        now = time.monotonic()
+        with self._user_profile_lock:
+            cached = self._user_profile_cache.get(user_id)
+        if cached and now < cached[0]:
+            return cached[1], cached[2]
+
+        try:
+            user_info = self.slack_app.client.users_info(user=user_id).get('user', {})
+        except Exception as e:
+            # Remember the failure briefly so a rate-limited or deleted user
+            # doesn't trigger another users_info call on every message
+            logger.warning("Could not retrieve user info for %s: %s", user_id, e)
+            user_address = f"Master <@{user_id}>"
+            with self._user_profile_lock:
+                self._user_profile_cache[user_id] = (now + USER_FAILURE_TTL, None, user_address)
+            return None, user_address
+
+        user_address = self._format_user_address(user_id, user_info)
+        with self._user_profile_lock:
+            self._user_profile_cache[user_id] = (now + USER_CACHE_TTL, user_info, user_address)
+        return user_info, user_address
+
+    def _get_user_profile(self, user_id):
+        """Get a user's Slack info (cached, see _lookup_user); empty if unavailable"""
+        return self._lookup_user(user_id)[0] or {}
+
+    def _format_user_address(self, user_id, user_info):
+        """Build the "Master ..." form of address from a user object"""
+        preferred_name = self.get_preferred_name(user_info)
+        
+        if preferred_name:
+            return f"Master {preferred_name}"
+        else:
+            return f"Master <@{user_id}>"
 
     def get_user_address(self, user_id):
         """Get the appropriate way to address a user"""
         try:
-            # Get full user info
-            user_info = self.slack_app.client.users_info(user=user_id).get('user', {})
-            preferred_name = self.get_preferred_name(user_info)
-            
-            if preferred_name:
-                return f"Master {preferred_name}"
-            else:
-                return f"Master <@{user_id}>"
+            # Address is computed once per cached profile
+            return self._lookup_user(user_id)[1]
         except Exception as e:
-            logger.warning(f"Could not retrieve user info: {e}")
+            logger.warning("Could not retrieve user info: %s", e)
             return f"Master <@{user_id}>"
 
+    def get_user_address_from_profile(self, user_info):
+        """
+        Get the address for a user object already carried by an event (e.g. team_join)
+        
+        Also warms the users_info cache so later handlers skip the lookup.
+        
+        Args:
+            user_info: Full Slack user object including 'id' and 'profile'
+            
+        Returns:
+            Formatted address for the user
+        """
+        user_id = user_info['id']
+        user_address = self._format_user_address(user_id, user_info)
+        with self._user_profile_lock:
+            self._user_profile_cache[user_id] = (time.monotonic() + USER_CACHE_TTL, user_info, user_address)
+        return user_address
+
+    def get_workspace_name(self):
+        """Get the workspace name, cached for WORKSPACE_NAME_TTL seconds"""
+        now = time.monotonic()
+        if self._workspace_name is None or now >= self._workspace_name_expiry:
+            workspace_info = self.slack_app.client.team_info()
+            self._workspace_name = workspace_info["team"]["name"]
+            self._workspace_name_expiry = now + WORKSPACE_NAME_TTL
+        return self._workspace_name
+
     def _get_alfred_style_response(self, user_id, category="general"):
         """Generate Alfred-style responses based on category"""
         # Use get_user_address for personalization
-        user_address = self.get_user_address(user_id)
+        return _alfred_response(self.get_user_address(user_id), category)
+
+    def _deployment_stats(self, channel_id):
+        """
+        Count recent workflow success/failure messages in a channel, cached for
+        DEPLOYMENT_STATS_TTL seconds so the mention and !ai paths share one scan
         
-        responses = {
-            "general": [
-                f"How may I be of service, {user_address}?",
-                f"At your disposal, {user_address}.",
-                f"As you wish, {user_address}."
-            ],
-            "error": [
-                f"My sincerest apologies, {user_address}. There seems to be a technical issue.",
-                f"I've encountered an error, {user_address}. Perhaps the Bat-Computer needs maintenance.",
-                f"Regrettably, I've hit a snag, {user_address}. Shall I prepare some tea while we troubleshoot?"
-            ],
-            "success": [
-                f"Task completed, {user_address}. Will there be anything else?",
-                f"It's been taken care of, {user_address}.",
-                f"Consider it done, {user_address}. Your digital affairs are in order."
-            ],
-            "greeting": [
-                f"Good day, {user_address}. How might I assist you today?",
-                f"Welcome, {user_address}. The digital manor is prepared for your arrival.",
-                f"{user_address}. A pleasure as always. What services do you require today?"
-            ]
-        }
+        Args:
+            channel_id: The Slack channel ID
+            
+        Returns:
+            Stats dict for get_contextual_response, or None if the channel has
+            no deployment messages
+        """
+        now = time.monotonic()
+        with self._deployment_stats_lock:
+            cached = self._deployment_stats_cache.get(channel_id)
+        if cached and now < cached[0]:
+            return cached[1]
+
+        history = self._slack_call(
+            self.slack_app.client.conversations_history,
+            channel=channel_id,
+            limit=50
+        )
+
+        success_count = 0
+        failure_count = 0
+        for msg in history.get("messages", []):
+            text = msg.get("text", "")
+            if "Workflow" not in text:
+                continue
+            lowered = text.lower()
+            if "success" in lowered:
+                success_count += 1
+            elif "failed" in lowered or "failure" in lowered:
+                failure_count += 1
+
+        stats = None
+        total = success_count + failure_count
+        if total > 0:
+            success_pct = int((success_count/total)*100)
+            failure_pct = int((failure_count/total)*100)
+            ratio_info = f"""
+            Based on the last {total} deployment messages in this channel:
+            - Successful deployments: {success_count} ({success_pct}%)  
+            - Failed deployments: {failure_count} ({failure_pct}%)
+            - Success ratio: {success_count}:{failure_count}
+            """
+            stats = {
+                'ratio_info': ratio_info,
+                'total': total,
+                'success_count': success_count,
+                'failure_count': failure_count,
+                'success_pct': success_pct,
+                'failure_pct': failure_pct
+            }
+
+        with self._deployment_stats_lock:
+            self._deployment_stats_cache[channel_id] = (now + DEPLOYMENT_STATS_TTL, stats)
+        return stats
+
+    def _route_query(self, query, lowered, user_id, channel, user_address):
+        """
+        Answer queries that have a dedicated route (time and deployment statistics)
+        
+        Shared by the mention and !ai handlers so the routing lives in one place.
         
-        category_responses = responses.get(category, responses["general"])
-        return random.choice(category_responses)
+        Args:
+            query: The user's message text
+            lowered: The query lowercased (computed once by the caller)
+            user_id: The Slack user ID of the asker
+            channel: The Slack channel ID the query came from
+            user_address: Formatted address for the user
+            
+        Returns:
+            Response text, or None if the query should take the handler's own path
+        """
+        return (
+            self._try_time_query(lowered, user_address)
+            or self._try_deployment_query(query, lowered, user_id, channel, user_address)
+        )
+
+    def _try_time_query(self, lowered, user_address):
+        """Answer a "what time is it in ..." query; None if the query isn't one"""
+        time_match = _TIME_RE.search(lowered)
+        if not time_match:
+            return None
+        location = time_match.group(1).strip()
+        time_str = self.get_time_for_location(location)
+        if time_str is None:
+            # Only a resolved time goes through the time-response templates
+            return f"I'm afraid I don't have timezone information for '{location}', {user_address}."
+        return self.ai_assistant.get_time_response(location, time_str, user_address)
+
+    def _try_deployment_query(self, query, lowered, user_id, channel, user_address):
+        """
+        Answer a workflow/deployment statistics query
+        
+        Returns:
+            Response text; None if the query isn't one or the channel has no
+            deployment messages (the caller's own path then answers it)
+        """
+        if not _WORKFLOW_RE.search(lowered):
+            return None
+        try:
+            stats = self._deployment_stats(channel)
+            if stats:
+                logger.info("Generating deployment statistics response for user %s", user_id)
+                return self.ai_assistant.get_contextual_response(query, user_address, workflow_stats=stats)
+        except Exception as e:
+            # Slack already failed for this query; answer without context rather than
+            # following up with more Slack calls
+            logger.error("Failed to get deployment statistics even with retries: %s", e)
+            return self.ai_assistant.get_contextual_response(query, user_address)
+        return None
 
     def get_time_for_location(self, location):
-        """Get current time for a given location using timezone database"""
+        """
+        Get current time for a given location using timezone database
+        
+        Args:
+            location: City/region or timezone name
+            
+        Returns:
+            Formatted local time, or None if the location has no known timezone
+        """
         try:
             location = location.lower().strip()
             
-            # Map common city/region names to timezone strings
-            common_locations = {
-                'new york': 'America/New_York',
-                'nyc': 'America/New_York',
-                'chicago': 'America/Chicago', 
-                'la': 'America/Los_Angeles',
-                'alaska': 'America/Anchorage',
-                'hawaii': 'Pacific/Honolulu',
-                'london': 'Europe/London',
-                'uk': 'Europe/London',
-                'france': 'Europe/Paris',
-                'germany': 'Europe/Berlin',
-                'italy': 'Europe/Rome',
-                'turkey': 'Europe/Istanbul',
-                'japan': 'Asia/Tokyo',
-                'tokyo': 'Asia/Tokyo',
-                'korea': 'Asia/Seoul',
-                'china': 'Asia/Shanghai',
-                'india': 'Asia/Kolkata',
-                'sydney': 'Australia/Sydney',
-                'pacific': 'America/Los_Angeles',
-                'eastern': 'America/New_York',
-                'central': 'America/Chicago',
-                'mountain': 'America/Denver'
-            }
-            
-            # Try direct mapping first
-            if location in common_locations:
-                timezone = pytz.timezone(common_locations[location])
-                current_time = datetime.datetime.now(timezone)
+            tz_name = _resolve_timezone_name(location)
+            if tz_name:
+                current_time = datetime.now(_tz(tz_name))
                 return current_time.strftime("%I:%M %p on %A, %B %d")
-                
-            # Try partial matching for country/region
-            for tz in pytz.common_timezones:
-                if location in tz.lower():
-                    timezone = pytz.timezone(tz)
-                    current_time = datetime.datetime.now(timezone)
-                    return current_time.strftime("%I:%M %p on %A, %B %d")
             
-            return f"I'm afraid I don't have timezone information for '{location}'."
+            return None
             
         except Exception as e:
-            logger.error(f"Error getting time for location {location}: {e}")
-            return f"I couldn't determine the time for {location}."
+            logger.error("Error getting time for location %s: %s", location, e)
+            return None
 
     def send_project_welcome_messages(self, user_id):
-        """Send welcome messages to project channels for new users"""
+        """Send welcome messages to project channels for new users (posted concurrently)"""
         user_address = self.get_user_address(user_id)
+        futures = []
         
         # UX Ops Project Channel
-        uxops_channel = os.getenv('UXOPS_CHANNEL')
-        if uxops_channel:
+        if UXOPS_CHANNEL:
+            futures.append(("UX Ops", _POST_POOL.submit(
+                self.slack_app.client.chat_postMessage,
+                channel=UXOPS_CHANNEL,
+                text=_UXOPS_WELCOME_TEMPLATE.format(user_address=user_address),
+                unfurl_links=False
+            )))
+        
+        # Afrotaku Project Channel
+        if AFROTAKU_CHANNEL:
+            futures.append(("Afrotaku", _POST_POOL.submit(
+                self.slack_app.client.chat_postMessage,
+                channel=AFROTAKU_CHANNEL,
+                text=_AFROTAKU_WELCOME_TEMPLATE.format(user_address=user_address),
+                unfurl_links=False
+            )))
+        
+        for project, future in futures:
+            try:
+                future.result()
+                logger.info("Sent %s welcome message to user %s", project, user_id)
+            except Exception as e:
+                logger.error("Failed to send %s welcome: %s", project, e)
+
+    def queue_announcement(self, channel_id, text):
+        """
+        Queue an announcement for a channel
+        
+        Announcements arriving within ANNOUNCEMENT_DEBOUNCE_SECONDS of each other
+        are posted together as one message with a section block per announcement.
+        
+        Args:
+            channel_id: The Slack channel ID
+            text: Announcement text (mrkdwn)
+        """
+        with self._announcement_lock:
+            self._pending_announcements.setdefault(channel_id, []).append(text)
+            
+            timer = self._announcement_timers.get(channel_id)
+            if timer:
+                timer.cancel()
+            timer = threading.Timer(ANNOUNCEMENT_DEBOUNCE_SECONDS, self._flush_announcements, args=(channel_id,))
+            timer.daemon = True
+            self._announcement_timers[channel_id] = timer
+            timer.start()
+
+    def _flush_announcements(self, channel_id):
+        """Post all queued announcements for a channel"""
+        with self._announcement_lock:
+            texts = self._pending_announcements.pop(channel_id, [])
+            self._announcement_timers.pop(channel_id, None)
+        
+        for start in range(0, len(texts), MAX_BLOCKS_PER_MESSAGE):
+            batch = texts[start:start + MAX_BLOCKS_PER_MESSAGE]
             try:
-                uxops_welcome = (
-                    f"*Welcome to #project-ux-ops*, {user_address} 🎩\n\n"
-                    f"This channel is dedicated to our UX Operations initiatives. Allow me to acquaint you with the resources at your disposal:\n\n"
-                    f"• *Project Overview*: <https://app.slack.com/canvas/C12345|UX Ops Project Canvas>\n"
-                    f"• *Task Management*: <https://trello.com/b/abcdef|UX Ops Trello Board>\n\n"
-                    f"I'm configured to assist with your Trello workflows in this channel:\n"
-                    f"• `!trello create [card title]` - Create a new task card\n"
-                    f"• `!trello lists` - View all task categories\n"
-                    f"• `!trello boards` - View connected project boards\n\n"
-                    f"Should you require anything else, I remain at your service."
-                )
-                
                 self.slack_app.client.chat_postMessage(
-                    channel=uxops_channel,
-                    text=uxops_welcome,
+                    channel=channel_id,
+                    text="\n\n".join(batch),
+                    blocks=[create_section_block(text) for text in batch],
                     unfurl_links=False
                 )
-                logger.info(f"Sent UX Ops welcome message to user {user_id}")
+                logger.info("Posted %s announcement(s) to channel %s", len(batch), channel_id)
             except Exception as e:
-                logger.error(f"Failed to send UX Ops welcome: {e}")
+                logger.error("Failed to post announcements to channel %s: %s", channel_id, e)
+
+    def _conversation_history(self, user_id, channel_id):
+        """
+        Get the AI history for a user in one channel, so DM turns never reach
+        channel prompts; idle conversations expire after AI_HISTORY_TTL seconds
         
-        # Afrotaku Project Channel
-        afrotaku_channel = os.getenv('AFROTAKU_CHANNEL')
-        if afrotaku_channel:
+        Args:
+            user_id: The Slack user ID
+            channel_id: The channel (or DM) the conversation happens in
+            
+        Returns:
+            deque of earlier (query, response) turns
+        """
+        key = (user_id, channel_id)
+        now = time.monotonic()
+        with self._ai_history_lock:
+            entry = self._ai_histories.pop(key, None)
+            history = entry[1] if entry and now < entry[0] else deque(maxlen=AI_HISTORY_TURNS)
+            self._ai_histories[key] = (now + AI_HISTORY_TTL, history)
+            while len(self._ai_histories) > AI_HISTORY_MAX_CONVERSATIONS:
+                self._ai_histories.popitem(last=False)
+        return history
+
+    def ask_with_history(self, user_id, channel_id, query, user_address, on_chunk=None):
+        """
+        Get a standard AI response that continues the user's earlier conversation in this channel
+        
+        Args:
+            user_id: The Slack user ID
+            channel_id: The channel (or DM) the query came from
+            query: The user's question
+            user_address: How to address the user
+            on_chunk: Optional callback receiving the partial response while it streams
+            
+        Returns:
+            str: AI-generated response
+        """
+        history = self._conversation_history(user_id, channel_id)
+        response = self.ai_assistant.get_contextual_response(
+            query, user_address, history=tuple(history), on_chunk=on_chunk
+        )
+        # Apologies aren't part of the conversation, so they're never replayed to the model
+        if not isinstance(response, FallbackResponse):
+            history.append((query, response))
+        return response
+
+    def reply_with_history(self, user_id, channel_id, query, user_address, say):
+        """
+        Answer a standard AI query, streaming into a placeholder message when
+        AI_STREAM_RESPONSES is enabled
+        
+        Args:
+            user_id: The Slack user ID
+            channel_id: The channel (or DM) the query came from
+            query: The user's question
+            user_address: How to address the user
+            say: Bolt say function for the conversation
+        """
+        if not AI_STREAM_RESPONSES:
+            say(self.ask_with_history(user_id, channel_id, query, user_address))
+            return
+        
+        placeholder = say(_STREAM_PLACEHOLDER)
+        ts = placeholder['ts']
+        last_update = time.monotonic()
+        
+        def on_chunk(partial):
+            nonlocal last_update
+            now = time.monotonic()
+            if now - last_update < STREAM_UPDATE_INTERVAL:
+                return
+            last_update = now
+            try:
+                self.slack_app.client.chat_update(channel=channel_id, ts=ts, text=partial)
+            except Exception as e:
+                logger.warning("Could not update streamed reply: %s", e)
+        
+        response = self.ask_with_history(user_id, channel_id, query, user_address, on_chunk=on_chunk)
+        self.slack_app.client.chat_update(channel=channel_id, ts=ts, text=response)
+
+    def queue_digest(self, channel_id, user_id):
+        """Queue a channel for the next scheduled digest batch"""
+        with self._digest_lock:
+            self._digest_queue[channel_id] = user_id
+
+    def _build_digest_context(self, channel_id):
+        """
+        Collect recent messages from a channel for a digest summary
+        
+        Args:
+            channel_id: The Slack channel ID
+            
+        Returns:
+            Dict context for summarize_conversation, or None if there is nothing to summarize
+        """
+        # Digests run on the scheduler, so no user is waiting on the retries
+        history = self._slack_call(
+            self.slack_app.client.conversations_history,
+            max_delay=SLACK_BACKGROUND_MAX_DELAY,
+            channel=channel_id,
+            limit=SUMMARY_HISTORY_LIMIT
+        )
+        
+        # Every fetched message is summarized except bot commands (Slack returns newest first)
+        messages = [msg['text'] for msg in history['messages'] if 'text' in msg and not msg['text'].startswith('!')]
+        if not messages:
+            return None
+        
+        return {
+            'channel_id': channel_id,
+            'channel_name': self.get_channel_name(channel_id),
+            'messages': " ".join(reversed(messages))
+        }
+
+    def flush_digest_queue(self):
+        """Summarize every queued channel in one batch and post each digest"""
+        with self._digest_lock:
+            queued = self._digest_queue
+            self._digest_queue = {}
+        if not queued:
+            return
+        
+        channel_ids = []
+        contexts = []
+        for channel_id, user_id in queued.items():
+            try:
+                context = self._build_digest_context(channel_id)
+            except Exception as e:
+                logger.error("Failed to collect digest messages for channel %s: %s", channel_id, e)
+                continue
+            if context:
+                context['user'] = user_id
+                channel_ids.append(channel_id)
+                contexts.append(context)
+        
+        logger.info("Generating digests for %s channel(s)", len(contexts))
+        summaries = self.ai_assistant.batch_summarize(contexts)
+        
+        for channel_id, context, summary in zip(channel_ids, contexts, summaries):
             try:
-                afrotaku_welcome = (
-                    f"*Welcome to #afrotaku*, {user_address} 🎩\n\n"
-                    f"This channel is dedicated to our Afrotaku creative initiatives. Allow me to present the resources at your disposal:\n\n"
-                    f"• *Project Overview*: <https://app.slack.com/canvas/C67890|Afrotaku Project Canvas>\n"
-                    f"• *Task Management*: <https://trello.com/b/ghijkl|Afrotaku Trello Board>\n\n"
-                    f"I've been programmed to assist with your Trello workflows in this channel:\n"
-                    f"• `!trello create [card title]` - Create a new task card\n"
-                    f"• `!trello lists` - View all task categories\n"
-                    f"• `!trello boards` - View connected project boards\n\n"
-                    f"Should you wish to link conversations to tasks, simply use `!trello comment [card ID] [your comment]`\n\n"
-                    f"As with all project channels, I can provide summaries of discussions with `!summarize`.\n\n"
-                    f"I shall endeavor to make your creative process as seamless as possible."
-                )
-                
                 self.slack_app.client.chat_postMessage(
-                    channel=afrotaku_channel,
-                    text=afrotaku_welcome,
-                    unfurl_links=False
+                    channel=channel_id,
+                    text=f"*Digest of recent conversation in #{context['channel_name']}*\n\n{summary}"
                 )
-                logger.info(f"Sent Afrotaku welcome message to user {user_id}")
             except Exception as e:
-                logger.error(f"Failed to send Afrotaku welcome: {e}")
+                logger.error("Failed to post digest to channel %s: %s", channel_id, e)
 
     def create_task_description(self, task_title):
         try:
             return self.ai_assistant.create_task_description(task_title)
         except Exception as e:
-            logger.error(f"Error generating task description: {e}")
+            logger.error("Error generating task description: %s", e)
             return f"Task: {task_title}"
 
     def get_channel_data(self, channel_id: str) -> Dict[str, Any]:
@@ -332,8 +985,9 @@ class PennyworthBot:
         """
         try:
             # Get channel info
-            channel_info = self.with_retry(
-                lambda: self.slack_app.client.conversations_info(channel=channel_id)
+            channel_info = self._slack_call(
+                self.slack_app.client.conversations_info,
+                channel=channel_id
             )["channel"]
 
             channel_name = channel_info.get("name", "unknown-channel")
@@ -342,12 +996,11 @@ class PennyworthBot:
             member_ids = []
             cursor = None
             while True:
-                result = self.with_retry(
-                    lambda: self.slack_app.client.conversations_members(
-                        channel=channel_id,
-                        limit=200,  # Maximum allowed by Slack API
-                        cursor=cursor
-                    )
+                result = self._slack_call(
+                    self.slack_app.client.conversations_members,
+                    channel=channel_id,
+                    limit=200,  # Maximum allowed by Slack API
+                    cursor=cursor
                 )
                 member_ids.extend(result["members"])
                 cursor = result.get("response_metadata", {}).get("next_cursor")
@@ -358,9 +1011,9 @@ class PennyworthBot:
             members_formatted = []
             for member_id in member_ids:
                 try:
-                    user_info = self.with_retry(
-                        lambda: self.slack_app.client.users_info(user=member_id)
-                    )["user"]
+                    user_info = self._get_user_profile(member_id)
+                    if not user_info:
+                        continue
 
                     display_name = user_info.get("profile", {}).get("display_name") or user_info.get("real_name") or "Unknown User"
 
@@ -369,11 +1022,11 @@ class PennyworthBot:
                         members_formatted.append(f"{display_name} (<@{member_id}>)")
 
                 except Exception as e:
-                    logger.warning(f"Error fetching user info for {member_id}: {e}")
+                    logger.warning("Error fetching user info for %s: %s", member_id, e)
                     
             # Format channel creation timestamp
             created_ts = int(channel_info.get("created", 0))
-            created = datetime.datetime.fromtimestamp(created_ts).strftime("%Y-%m-%d") if created_ts > 0 else "Unknown"
+            created = datetime.fromtimestamp(created_ts).strftime("%Y-%m-%d") if created_ts > 0 else "Unknown"
             
             # Return structured channel data
             return {
@@ -389,7 +1042,7 @@ class PennyworthBot:
             }
             
         except Exception as e:
-            logger.error(f"Error fetching channel data: {e}")
+            logger.error("Error fetching channel data: %s", e)
             return {
                 "name": "unknown-channel",
                 "topic": "Unable to fetch channel information",
@@ -399,6 +1052,12 @@ class PennyworthBot:
             }
 
     def _register_handlers(self):
+        # Fail fast if listeners were already registered on this App - a double
+        # registration would run every handler (and its API calls) twice per event
+        if getattr(self.slack_app, '_pennyworth_registered', False):
+            raise RuntimeError("Pennyworth handlers are already registered on this Slack app")
+        self.slack_app._pennyworth_registered = True
+
         # Enhanced greeting
         @self.slack_app.message("hello")
         def say_hello(message: Dict[str, Any], say: Callable[[str], None]) -> None:
@@ -406,27 +1065,11 @@ class PennyworthBot:
             greeting = self._get_time_greeting()
             user_address = self.get_user_address(user_id)
             
-            # Common responses for any time of day
-            common_responses = [
-                f"{greeting}, {user_address}. How might I be of service today?",
-                f"{greeting}, {user_address}. I trust you're well. Is there anything you require?",
-                f"{greeting}, {user_address}. Always a pleasure to be of assistance.",
-                f"{greeting}, {user_address}. I've prepared your digital workspace. What shall we accomplish today?"
-            ]
-            
-            # Start with the common responses
-            responses = common_responses.copy()
-
-            # Add time-specific responses
-            if greeting in ["Good evening", "Good night"]:
-                responses.append(f"{greeting}, {user_address}. Dare we hope that Gotham treats you to an early evening? :bat:")
-            
-            if greeting == "Good morning":
-                responses.append(f"{greeting}, {user_address}. I've prepared your usual breakfast: toast :bread:, coffee :coffee:, bandages :adhesive_bandage:.")
+            # Common responses plus any time-specific extras
+            templates = _HELLO_POOLS.get(greeting, _HELLO_TEMPLATES)
 
             # Randomize response
-            response = responses[random.randint(0, len(responses) - 1)]
-            say(response)
+            say(random.choice(templates).format(greeting=greeting, user_address=user_address))
 
         @self.slack_app.event("app_mention")
         def handle_app_mentions(body: Dict[str, Any], say: Callable[[str, Optional[Dict[str, Any]]], None]) -> None:
@@ -439,32 +1082,25 @@ class PennyworthBot:
                 message_ts = body["event"].get("ts")
 
                 # Extract the actual message content (remove the app mention part)
-                message_text = re.sub(r"<@[A-Z0-9]+>\s*", "", text).strip()
+                message_text = _MENTION_RE.sub("", text).strip()
                 user_address = self.get_user_address(user_id)
                 
                 # If it's just a mention with no text, provide a helpful response
                 if not message_text:
-                    responses = [
-                        f"You rang, {user_address}? How may I be of assistance?",
-                        f"At your service, {user_address}. How might I help?",
-                        f"{user_address}, I'm attending. What do you require?"
-                    ]
+                    response = random.choice(_EMPTY_MENTION_TEMPLATES).format(user_address=user_address)
                     # If in thread, reply to thread
                     if is_in_thread:
-                        say(text=random.choice(responses), thread_ts=thread_ts)
+                        say(text=response, thread_ts=thread_ts)
                     else:
-                        say(random.choice(responses))
+                        say(response)
                     return
                 
-                # Check for time-related queries
-                time_pattern = re.compile(r"what(?:'s| is) (?:the )?time(?: in | at )([a-zA-Z\s]+)\??")
-                time_match = time_pattern.search(message_text.lower())
+                # Lowercased once for all of the keyword/pattern checks below
+                lowered = message_text.lower()
                 
-                if time_match:
-                    location = time_match.group(1).strip()
-                    time_str = self.get_time_for_location(location)
-                    response = self.ai_assistant.get_time_response(location, time_str, user_address)
-                    
+                # Time and deployment-statistics queries have dedicated answers
+                response = self._route_query(message_text, lowered, user_id, channel, user_address)
+                if response:
                     # If in thread, reply to thread
                     if is_in_thread:
                         say(text=response, thread_ts=thread_ts)
@@ -472,53 +1108,6 @@ class PennyworthBot:
                         say(response)
                     return
                 
-                # Check for workflow/deployment statistics
-                if "workflow" in message_text.lower() or "deployment" in message_text.lower() or "ratio" in message_text.lower() or "success" in message_text.lower():
-                    try:
-                        history = self.with_retry(
-                            lambda: self.slack_app.client.conversations_history(
-                                channel=channel,
-                                limit=50
-                            )
-                        )
-                        
-                        # Extract deployment status messages
-                        deployment_messages = []
-                        success_count = 0
-                        failure_count = 0
-                        
-                        for msg in history.get("messages", []):
-                            text = msg.get("text", "")
-                            if "Workflow" in text and ("success" in text.lower() or "failed" in text.lower() or "failure" in text.lower()):
-                                deployment_messages.append(text)
-                                if "success" in text.lower():
-                                    success_count += 1
-                                elif "failed" in text.lower() or "failure" in text.lower():
-                                    failure_count += 1
-                        
-                        total = success_count + failure_count
-                        if total > 0:
-                            ratio_info = f"""
-            Based on the last {total} deployment messages in this channel:
-            - Successful deployments: {success_count} ({int((success_count/total)*100)}%)  
-            - Failed deployments: {failure_count} ({int((failure_count/total)*100)}%)
-            - Success ratio: {success_count}:{failure_count}
-            """
-                                                       
-                            # Generate AI response with stats context
-                            logger.info(f"Generating deployment statistics response for user {user_id}")
-                            stats = {'ratio_info': ratio_info}
-                            response = self.ai_assistant.get_contextual_response(message_text, user_address, workflow_stats=stats)
-
-                            # If in thread, reply to thread
-                            if is_in_thread:
-                                say(text=response, thread_ts=thread_ts)
-                            else:
-                                say(response)
-                            return
-                    except Exception as e:
-                        logger.error(f"Failed to get conversation history even with retries: {e}")
-                
                 # Thread awareness - get thread context if in a thread
                 if is_in_thread:
                     try:
@@ -528,17 +1117,17 @@ class PennyworthBot:
                             limit=10
                         )
                         
-                        # Extract thread messages and participants
-                        thread_messages = []
-                        participants = set()
+                        # Keep the most recent thread messages, skipping the current one
+                        thread_messages = deque(
+                            (
+                                f"<@{msg.get('user', 'unknown')}>: {msg['text']}"
+                                for msg in thread_history.get("messages", [])
+                                if "text" in msg and msg["ts"] != message_ts
+                            ),
+                            maxlen=THREAD_CONTEXT_MESSAGES
+                        )
                         
-                        for msg in thread_history.get("messages", []):
-                            if "text" in msg and msg["ts"] != message_ts:  # Skip the current message
-                                user_id = msg.get('user', 'unknown')
-                                thread_messages.append(f"<@{user_id}>: {msg['text']}")
-                                participants.add(user_id)
-                                                
-                        logger.info(f"Generating thread-aware response for user {user_id}")
+                        logger.info("Generating thread-aware response for user %s", user_id)
                         response = self.ai_assistant.get_contextual_response(
                             query=message_text,
                             user_address=user_address,
@@ -548,17 +1137,10 @@ class PennyworthBot:
                         say(text=response, thread_ts=thread_ts)
                         return
                     except Exception as e:
-                        logger.error(f"Error processing thread context: {e}")
+                        logger.error("Error processing thread context: %s", e)
                 
                 # Detect if query is asking about channel information
-                channel_info_patterns = [
-                    r"(?:who|what|list|tell).+(?:members|users|people|participants)",
-                    r"(?:who).+(?:in|part of).+(?:channel|here|this)",
-                    r"(?:tell|show).+(?:about|info|information).+(?:channel|here)",
-                    r"(?:what).+(?:channel|topic|purpose)"
-                ]
-
-                is_channel_query = any(re.search(pattern, message_text.lower()) for pattern in channel_info_patterns)
+                is_channel_query = _CHANNEL_INFO_RE.search(lowered) is not None
 
                 if is_channel_query:
                     # Fetch channel data and use the enhanced contextual response
@@ -585,204 +1167,104 @@ class PennyworthBot:
                     say(response)
 
             except Exception as e:
-                logger.error(f"Error handling app mention: {str(e)}")
+                logger.error("Error handling app mention: %s", e)
                 say(f"I do apologize, but I'm experiencing some technical difficulties. Error details: {str(e)}")
 
+        # Keep the cached form of address current when a profile changes
+        @self.slack_app.event("user_change")
+        def refresh_user_profile(event: Dict[str, Any]) -> None:
+            try:
+                # user_change carries the full updated user object
+                self.get_user_address_from_profile(event["user"])
+            except Exception as e:
+                logger.warning("Could not refresh cached user profile: %s", e)
+
+        # Keep cached channel names current when a channel is renamed
+        @self.slack_app.event("channel_rename")
+        def refresh_channel_name(event: Dict[str, Any]) -> None:
+            channel = event.get("channel", {})
+            if channel.get("id"):
+                self._cache_channel_name(channel["id"], channel.get("name"))
+
         # New User Join Notification with improved Alfred tone
         @self.slack_app.event("team_join")
         def welcome_new_user(event: Dict[str, Any], say: Callable[[str], None]) -> None:
             try:
                 user = event["user"]
-                user_address = self.get_user_address(user['id'])
+                # team_join carries the full user object, so no users_info round-trip is needed
+                user_address = self.get_user_address_from_profile(user)
                 
                 # Get workspace name
                 try:
-                    workspace_info = self.slack_app.client.team_info()
-                    workspace_name = workspace_info["team"]["name"]
+                    workspace_name = self.get_workspace_name()
                 except Exception as e:
-                    logger.warning(f"Could not retrieve workspace name: {e}")
+                    logger.warning("Could not retrieve workspace name: %s", e)
                     workspace_name = "the ship"
                 
                 # Direct welcome message to the user
-                welcome_message = (
-                    f"Good day, {user_address}. Welcome aboard {workspace_name}. 🎩\n\n"
-                    "I'm Pennyworth, your AI butler. Allow me to assist with your orientation:\n"
-                    "• The study contains our documentation and project resources\n"
-                    "• The #galley channel hosts our common area for all manner of discourse\n"
-                    "• Your quarters await your personal profile setup\n\n"
-                    "Should you require anything, simply summon me with `!ai [your question]` or engage with me via the *Apps* directory below."
+                welcome_message = _WELCOME_TEMPLATE.format(
+                    user_address=user_address,
+                    workspace_name=workspace_name
                 )
                 say(welcome_message)
-                logger.info(f"Welcomed new user: {user['id']}")
+                logger.info("Welcomed new user: %s", user['id'])
                 
                 # Notify galley channel about the new user with Alfred-style formality
-                galley_channel = os.getenv('GALLEY_CHANNEL')
-                
                 # Create a formal butler-style announcement for galley
-                galley_announcement = (
-                    f"*Announcing a new arrival* 🎩\n\n"
-                    f"May I present {user_address}, who has just joined our distinguished company.\n\n"
-                    f"*For those unfamiliar with my services:*\n"
-                    f"• Summon my assistance with `!ai [your question]` for information, guidance, or witty banter\n"
-                    f"• Request `!summarize` in any channel for a concise briefing of recent discussions\n"
-                    f"• React to messages with emoji reactions that I shall dutifully mirror\n"
-                    f"• Create reminders that I shall manage with utmost attention to detail\n"
-                    f"• Engage me in direct messages for more private inquiries\n\n"
-                    f"A full catalogue of my capabilities is available via the <https://app.slack.com/app-settings/T08DSA45NDV/A08E8UZSGK9|Slack App Directory>.\n\n"
-                    f"I shall be attending to {user_address}'s orientation. Do make them feel welcome.\n"
-                    f"As always, I remain at your service in all channels. Simply call when needed."
-                )
+                galley_announcement = _GALLEY_ANNOUNCEMENT_TEMPLATE.format(user_address=user_address)
                 
-                # Send the announcement to galley
-                self.slack_app.client.chat_postMessage(
-                    channel=galley_channel,
-                    text=galley_announcement,
-                    unfurl_links=False
-                )
+                # Queue the announcement for galley (batched with other recent joins)
+                if GALLEY_CHANNEL:
+                    self.queue_announcement(GALLEY_CHANNEL, galley_announcement)
                 
                 # Send project-specific welcome messages
                 self.send_project_welcome_messages(user['id'])
                 
             except Exception as e:
-                logger.error(f"Error welcoming new user: {e}")
+                logger.error("Error welcoming new user: %s", e)
                 say("A technical issue prevents me from properly welcoming our new guest. My apologies.")
 
         # AI Assistant Interaction with Alfred personality - Using properly personalized addressing
-        @self.slack_app.message(re.compile(r"^!ai\s+(.+)"))
-        def ai_assistant(message: Dict[str, Any], say: Callable[[str], None]) -> None:
+        @self.slack_app.message(_AI_RE)
+        def ai_assistant(message: Dict[str, Any], context: Dict[str, Any], say: Callable[[str], None]) -> None:
             user_id = message.get('user', 'unknown')
             try:
-                # Extract user query using regex
-                match = re.search(r"^!ai\s+(.+)", message['text'])
-                query = match.group(1) if match else None
+                # Reuse the query group Bolt captured when matching _AI_RE
+                matches = context.get('matches') or ()
+                query = matches[0].strip() if matches else ""
                 
                 if not query:
                     user_address = self.get_user_address(user_id)
                     say(f"How may I assist you, {user_address}? Please provide a query after the !ai command.")
                     return
 
-                # Check for time-related queries
-                time_pattern = re.compile(r"what(?:'s| is) (?:the )?time(?: in | at )([a-zA-Z\s]+)\??")
-                time_match = time_pattern.search(query.lower())
+                # Only the form of address is needed (served from the user cache)
+                user_address = self.get_user_address(user_id)
 
-                if time_match:
-                    location = time_match.group(1).strip()
-                    time_str = self.get_time_for_location(location)
-                    user_address = self.get_user_address(user_id)
-                    response = self.ai_assistant.get_time_response(location, time_str, user_address)
+                # Time and deployment-statistics queries have dedicated answers
+                response = self._route_query(query, query.lower(), user_id, message.get('channel'), user_address)
+                if response:
                     say(response)
                     return
 
-                # Get user info for context
-                user_info = self.slack_app.client.users_info(user=user_id).get('user', {})
-                user_address = self.get_user_address(user_id)
-                                
-                # Check for workflow/deployment statistics
-                if "workflow" in query.lower() or "deployment" in query.lower() or "ratio" in query.lower() or "success" in query.lower():
-                    try:
-                        channel_id = message.get('channel')
-
-                        history = self.with_retry(
-                            lambda: self.slack_app.client.conversations_history(
-                                channel=channel_id,
-                                limit=50
-                            )
-                        )
-                        
-                        # Extract deployment status messages
-                        deployment_messages = []
-                        success_count = 0
-                        failure_count = 0
-                        
-                        for msg in history.get("messages", []):
-                            text = msg.get("text", "")
-                            if "Workflow" in text and ("success" in text.lower() or "failed" in text.lower() or "failure" in text.lower()):
-                                deployment_messages.append(text)
-                                if "success" in text.lower():
-                                    success_count += 1
-                                elif "failed" in text.lower() or "failure" in text.lower():
-                                    failure_count += 1
-                        
-                        total = success_count + failure_count
-                        if total > 0:
-                            ratio_info = f"""
-            Based on the last {total} deployment messages in this channel:
-            - Successful deployments: {success_count} ({int((success_count/total)*100)}%)  
-            - Failed deployments: {failure_count} ({int((failure_count/total)*100)}%)
-            - Success ratio: {success_count}:{failure_count}
-            """
-                            
-                            # Use AI assistant with workflow stats
-                            user_address = self.get_user_address(user_id)
-                            stats = {'ratio_info': ratio_info}
-                            response = self.ai_assistant.get_contextual_response(query, user_address, workflow_stats=stats)
-                            
-                            say(response)
-                            return
-                    except Exception as e:
-                        logger.error(f"Error processing deployment statistics even with retries: {e}")
-
-                # Standard response
-                user_address = self.get_user_address(user_id)
-                response = self.ai_assistant.get_contextual_response(query, user_address)
-                say(response)
+                # Standard response, continuing the user's conversation
+                self.reply_with_history(user_id, message.get('channel'), query, user_address, say)
                 
             except Exception as e:
-                logger.error(f"AI assistant error: {str(e)}")
+                logger.error("AI assistant error: %s", e)
                 error_message = self._get_alfred_style_response(user_id, "error")
                 say(f"{error_message} Technical details: {str(e)}")
 
         # Summarize conversation feature
-        @self.slack_app.message(re.compile(r"^!summarize"))
-        def summarize_conversation(message: Dict[str, Any], say: Callable[[str], None]) -> None:
-            try:
-                channel_id = message['channel']
-                user_id = message.get('user')
-                user_address = self.get_user_address(user_id)
-                
-                channel_info = self.slack_app.client.conversations_info(channel=channel_id)
-                channel_name = channel_info['channel']['name'] if 'name' in channel_info['channel'] else "this conversation"
-                
-                history = self.with_retry(
-                    lambda: self.slack_app.client.conversations_history(
-                        channel=channel_id,
-                        limit=50
-                    )
-                )                
-                # Skip the command message itself
-                messages = [msg['text'] for msg in history['messages'] if 'text' in msg and '!summarize' not in msg['text']][::-1]
-                
-                if not messages:
-                    say(f"There's no recent conversation to summarize, {user_address}.")
-                    return
-                    
-                # Create summarization prompt
-                summary_prompt = f"""
-            Please summarize the following conversation in the style of Alfred Pennyworth from the Batman Arkham games:
-            formal, dignified, and slightly sardonic.
-
-            Keep the summary concise (no more than 150 words) but comprehensive, capturing the main topics and any important decisions or action items.
-
-            CONVERSATION:
-            {" ".join(messages[:20])}
-            """
-
-                context = {
-                    'channel_name': channel_name,
-                    'messages': " ".join(messages[:20]),
-                    'user': message.get('user')
-                }
+        self.slack_app.message(_SUMMARIZE_RE)(self._handle_summarize)
 
-                # Generate summary
-                logger.info(f"Generating conversation summary for channel {channel_id}")
-                summary = self.ai_assistant.summarize_conversation(context)
-                say(f"*Summary of recent conversation in #{channel_name}*\n\n{summary}")
-            
-            except Exception as e:
-                logger.error(f"Failed to summarize conversation history even with retries: {e}")
-                user_id = message.get('user')
-                user_address = self.get_user_address(user_id)
-                say(f"I'm terribly sorry, {user_address}. I couldn't summarize the conversation at this time.")
+        # Queue a channel for the scheduled digest
+        @self.slack_app.message(_DIGEST_RE)
+        def request_digest(message: Dict[str, Any], say: Callable[[str], None]) -> None:
+            user_id = message.get('user')
+            user_address = self.get_user_address(user_id)
+            self.queue_digest(message['channel'], user_id)
+            say(f"Very good, {user_address}. A digest of this channel shall be delivered with my next scheduled round.")
 
         @self.slack_app.message("")
         def handle_direct_messages(message: Dict[str, Any], say: Callable[[str], None]) -> None:
@@ -798,93 +1280,155 @@ class PennyworthBot:
             # Only process DMs
             if channel_type == "im" and not text.startswith("!"):
                 user_address = self.get_user_address(user_id)
-                response = self.ai_assistant.get_contextual_response(text, user_address)
-                say(response)
+                self.reply_with_history(user_id, message.get('channel'), text, user_address, say)
 
-        @self.slack_app.message(re.compile(r"^!trello\s+(.+)"))
-        def handle_trello_workflow(message: Dict[str, Any], say: Callable[[str], None]) -> None:
-            user_id = message.get('user', 'unknown')
+        self.slack_app.message(_TRELLO_RE)(self._handle_trello)
+
+    def _handle_summarize(self, message: Dict[str, Any], say: Callable[[str], None]) -> None:
+        """Summarize the recent conversation in a channel (`!summarize`)"""
+        try:
+            channel_id = message['channel']
+            user_id = message.get('user')
             user_address = self.get_user_address(user_id)
-            channel_id = message.get('channel', '')
             
-            try:
-                # Extract command text
-                text = message['text'].replace('!trello', '', 1).strip()
-                
-                # Parse command using trello workflow module
-                command, args = self.trello_workflow.parse_command(text)
-                
-                # Handle different Trello commands
-                if command == "create" and "card_title" in args:
-                    board_name = "Main Board"  # Default board, can be customized
-                    result = self.trello_workflow.create_card(
-                        board_name=board_name,
-                        list_name=args.get("list_name", "To Do"),
-                        title=args["card_title"],
-                        description=self.create_task_description(args["card_title"]) if self.create_task_description else None
-                    )
-                    
-                    if result["success"]:
-                        say(f"I've created your Trello card, {user_address}.\n*Title:* {result['card_name']}\n*URL:* {result['card_url']}")
-                        logger.info(f"Created Trello card for user {user_id}: {result['card_name']}")
-                    else:
-                        error = result["error"]
-                        say(f"I'm afraid I couldn't create the card, {user_address}: {error}")
-                
-                elif command == "boards":
-                    result = self.trello_workflow.get_boards()
-                    if result["success"]:
-                        boards = result["boards"]
-                        if boards:
-                            board_list = "\n".join([f"• *{board['name']}*" for board in boards])
-                            say(f"The following Trello boards are at your disposal, {user_address}:\n\n{board_list}")
-                        else:
-                            say(f"I'm afraid I couldn't find any Trello boards, {user_address}. Would you like me to create one?")
-                    else:
-                        say(f"I encountered an issue retrieving the boards, {user_address}: {result['error']}")
-                
-                elif command == "lists" and "board_name" in args:
-                    result = self.trello_workflow.get_lists(args["board_name"])
-                    if result["success"]:
-                        lists = result["lists"]
-                        if lists:
-                            list_names = "\n".join([f"• *{lst['name']}*" for lst in lists])
-                            say(f"For the *{result['board_name']}* board, the following lists are available, {user_address}:\n\n{list_names}")
-                        else:
-                            say(f"The *{result['board_name']}* board appears to be empty, {user_address}. Would you like me to create some lists?")
-                    else:
-                        say(f"I couldn't find that board, {user_address}. {result['error']}")
-                
-                elif command == "comment" and "card_id" in args and "comment_text" in args:
-                    result = self.trello_workflow.add_comment(args["card_id"], args["comment_text"])
-                    if result["success"]:
-                        say(f"I've added your comment to the card, {user_address}.")
-                    else:
-                        say(f"I'm terribly sorry, {user_address}. I couldn't add your comment: {result['error']}")
+            # The name lookup (cached, see get_channel_name) overlaps the history fetch
+            channel_name_future = _POST_POOL.submit(self.get_channel_name, channel_id)
+            
+            history = self._slack_call(
+                self.slack_app.client.conversations_history,
+                channel=channel_id,
+                limit=SUMMARY_HISTORY_LIMIT
+            )
+            channel_name = channel_name_future.result()
+            # The newest SUMMARY_HISTORY_LIMIT messages, oldest first (Slack returns
+            # newest first), skipping the command itself
+            messages = [
+                msg['text'] for msg in reversed(history['messages'])
+                if msg.get('text') and '!summarize' not in msg['text']
+            ]
+            
+            if not messages:
+                say(f"There's no recent conversation to summarize, {user_address}.")
+                return
                 
-                elif command == "move" and "card_id" in args and "list_name" in args:
-                    result = self.trello_workflow.move_card(args["card_id"], args["list_name"])
-                    if result["success"]:
-                        say(f"I've moved the card to *{args['list_name']}*, {user_address}.")
-                    else:
-                        say(f"I was unable to move the card, {user_address}: {result['error']}")
+            conversation = " ".join(messages)
+
+            context = {
+                'channel_id': channel_id,
+                'channel_name': channel_name,
+                'messages': conversation,
+                'user': message.get('user')
+            }
+
+            # Generate summary
+            logger.info("Generating conversation summary for channel %s", channel_id)
+            summary = self.ai_assistant.summarize_conversation(context)
+            say(f"*Summary of recent conversation in #{channel_name}*\n\n{summary}")
+        
+        except Exception as e:
+            logger.error("Failed to summarize conversation history even with retries: %s", e)
+            user_id = message.get('user')
+            user_address = self.get_user_address(user_id)
+            say(f"I'm terribly sorry, {user_address}. I couldn't summarize the conversation at this time.")
+
+    def _handle_trello(self, message: Dict[str, Any], context: Dict[str, Any], say: Callable[[str], None]) -> None:
+        """Run a `!trello` subcommand"""
+        user_id = message.get('user', 'unknown')
+        user_address = self.get_user_address(user_id)
+        channel_id = message.get('channel', '')
+        
+        try:
+            # Reuse the command text Bolt captured when matching _TRELLO_RE
+            matches = context.get('matches') or ()
+            text = matches[0].strip() if matches else message['text'].removeprefix('!trello').strip()
+            
+            # Parse command using trello workflow module
+            command, args = self.trello_workflow.parse_command(text)
+            
+            # Dispatch to the subcommand handler (help for anything unknown)
+            handler = self._trello_handlers.get(command, self._trello_help)
+            handler(args, say, user_address, user_id)
                 
-                else:
-                    # Help message for unknown commands
-                    help_text = (
-                        f"*Trello Commands*, {user_address}:*\n"
-                        "• `!trello create [card title] in [list name]` - Create a new task card\n"
-                        "• `!trello move [card ID] to [list name]` - Move a card to another list\n"
-                        "• `!trello comment [card ID] [comment text]` - Add a comment to a card\n"
-                        "• `!trello boards` - List available boards\n"
-                        "• `!trello lists [board name]` - List the lists in a specific board\n"
-                    )
-                    say(help_text)
-                    
-            except Exception as e:
-                logger.error(f"Trello workflow error: {str(e)}")
-                error_message = self._get_alfred_style_response(user_id, "error")
-                say(f"{error_message} The Trello system appears to be offline: {str(e)}")
+        except Exception as e:
+            logger.error("Trello workflow error: %s", e)
+            # The address was resolved before the command ran
+            error_message = _alfred_response(user_address, "error")
+            say(f"{error_message} The Trello system appears to be offline: {str(e)}")
+
+    def _trello_create(self, args, say, user_address, user_id):
+        """Handle `!trello create [card title] in [list name]`"""
+        if "card_title" not in args:
+            return self._trello_help(args, say, user_address, user_id)
+        
+        board_name = "Main Board"  # Default board, can be customized
+        result = self.trello_workflow.create_card(
+            board_name=board_name,
+            list_name=args.get("list_name", "To Do"),
+            title=args["card_title"],
+            description=self.create_task_description(args["card_title"]) if self.create_task_description else None
+        )
+        
+        if result["success"]:
+            say(f"I've created your Trello card, {user_address}.\n*Title:* {result['card_name']}\n*URL:* {result['card_url']}")
+            logger.info("Created Trello card for user %s: %s", user_id, result['card_name'])
+        else:
+            error = result["error"]
+            say(f"I'm afraid I couldn't create the card, {user_address}: {error}")
+
+    def _trello_boards(self, args, say, user_address, user_id):
+        """Handle `!trello boards`"""
+        result = self.trello_workflow.get_boards()
+        if result["success"]:
+            boards = result["boards"]
+            if boards:
+                board_list = "\n".join(f"• *{board['name']}*" for board in boards)
+                say(f"The following Trello boards are at your disposal, {user_address}:\n\n{board_list}")
+            else:
+                say(f"I'm afraid I couldn't find any Trello boards, {user_address}. Would you like me to create one?")
+        else:
+            say(f"I encountered an issue retrieving the boards, {user_address}: {result['error']}")
+
+    def _trello_lists(self, args, say, user_address, user_id):
+        """Handle `!trello lists [board name]`"""
+        if "board_name" not in args:
+            return self._trello_help(args, say, user_address, user_id)
+        
+        result = self.trello_workflow.get_lists(args["board_name"])
+        if result["success"]:
+            lists = result["lists"]
+            if lists:
+                list_names = "\n".join(f"• *{lst['name']}*" for lst in lists)
+                say(f"For the *{result['board_name']}* board, the following lists are available, {user_address}:\n\n{list_names}")
+            else:
+                say(f"The *{result['board_name']}* board appears to be empty, {user_address}. Would you like me to create some lists?")
+        else:
+            say(f"I couldn't find that board, {user_address}. {result['error']}")
+
+    def _trello_comment(self, args, say, user_address, user_id):
+        """Handle `!trello comment [card ID] [comment text]`"""
+        if "card_id" not in args or "comment_text" not in args:
+            return self._trello_help(args, say, user_address, user_id)
+        
+        result = self.trello_workflow.add_comment(args["card_id"], args["comment_text"])
+        if result["success"]:
+            say(f"I've added your comment to the card, {user_address}.")
+        else:
+            say(f"I'm terribly sorry, {user_address}. I couldn't add your comment: {result['error']}")
+
+    def _trello_move(self, args, say, user_address, user_id):
+        """Handle `!trello move [card ID] to [list name]`"""
+        if "card_id" not in args or "list_name" not in args:
+            return self._trello_help(args, say, user_address, user_id)
+        
+        result = self.trello_workflow.move_card(args["card_id"], args["list_name"])
+        if result["success"]:
+            say(f"I've moved the card to *{args['list_name']}*, {user_address}.")
+        else:
+            say(f"I was unable to move the card, {user_address}: {result['error']}")
+
+    def _trello_help(self, args, say, user_address, user_id):
+        """Show the !trello help message for unknown or incomplete commands"""
+        say(_TRELLO_HELP_TEMPLATE.format(user_address=user_address))
 
     def start_health_check_scheduler(self):
         """Start a background thread for periodic health checks"""
@@ -895,6 +1439,9 @@ class PennyworthBot:
             # Schedule to run every 4 hours
             schedule.every(4).hours.do(self.perform_health_check)
             
+            # Deliver queued !digest summaries in one batch
+            schedule.every(DIGEST_INTERVAL_HOURS).hours.do(self.flush_digest_queue)
+            
             while True:
                 schedule.run_pending()
                 time.sleep(3600)  # Check every hour for scheduled tasks
@@ -905,24 +1452,24 @@ class PennyworthBot:
 
     def perform_health_check(self):
         """Perform health checks on all external services"""
-        logger.info(f"Running health check at {datetime.now().isoformat()}")
+        logger.info("Running health check at %s", datetime.now().isoformat())
         
         # Check Slack connection
         try:
-            result = self.with_retry(lambda: self.slack_app.client.auth_test())
-            logger.info(f"Slack connection OK (authenticated as {result.get('user')})")
+            result = self._slack_call(self.slack_app.client.auth_test)
+            logger.info("Slack connection OK (authenticated as %s)", result.get('user'))
         except Exception as e:
-            logger.error(f"Slack connection check failed: {e}")
+            logger.error("Slack connection check failed: %s", e)
         
         # Check Trello connection
         try:
             boards = self.trello_workflow.get_boards()
             if boards.get("success"):
-                logger.info(f"Trello connection OK ({len(boards.get('boards', []))} boards accessible)")
+                logger.info("Trello connection OK (%s boards accessible)", len(boards.get('boards', [])))
             else:
-                logger.error(f"Trello connection check failed: {boards.get('error')}")
+                logger.error("Trello connection check failed: %s", boards.get('error'))
         except Exception as e:
-            logger.error(f"Trello connection check failed: {e}")
+            logger.error("Trello connection check failed: %s", e)
         
         # Check AI model connection
         try:
@@ -931,31 +1478,57 @@ class PennyworthBot:
             if response and "OK" in response:
                 logger.info("AI model connection OK")
             else:
-                logger.warning(f"AI model check returned unexpected response: {response[:50]}...")
+                logger.warning("AI model check returned unexpected response: %s...", response[:50])
         except Exception as e:
-            logger.error(f"AI model check failed: {e}")
+            logger.error("AI model check failed: %s", e)
+
+    def warm_up(self):
+        """Prime API connections and caches so the first user request skips the cold path"""
+        started = time.monotonic()
+        
+        try:
+            self.slack_app.client.auth_test()
+        except Exception as e:
+            logger.warning("Slack warm-up failed: %s", e)
+        
+        boards = self.trello_workflow.get_boards()
+        if not boards.get("success"):
+            logger.warning("Trello warm-up failed: %s", boards.get("error"))
+        
+        logger.info("Warm-up finished in %.2fs", time.monotonic() - started)
 
-    def start(self):
+    def start(self, ready_event=None):
+        """
+        Connect to Slack and block serving events
+        
+        Args:
+            ready_event: Optional threading.Event set once the Socket Mode connections are open
+        """
         try:
             logger.info("Starting Pennyworth Bot")
             
+            threading.Thread(target=self.warm_up, daemon=True).start()
+            
             self.start_health_check_scheduler()
             logger.info("Health checks scheduled (every 4 hours)")
             
-            handler = SocketModeHandler(
-                self.slack_app, 
-                os.getenv('SLACK_APP_TOKEN'),
-                ping_interval=30
-            )
-            handler.start()
+            # Slack spreads events across every open connection, and a
+            # reconnecting socket no longer leaves the bot deaf
+            self.socket_handlers = []
+            for _ in range(SOCKET_CONNECTIONS):
+                handler = SocketModeHandler(
+                    self.slack_app, 
+                    os.getenv('SLACK_APP_TOKEN'),
+                    ping_interval=SOCKET_PING_INTERVAL,
+                    concurrency=SOCKET_MODE_CONCURRENCY
+                )
+                handler.connect()
+                self.socket_handlers.append(handler)
+            logger.info("Opened %s Socket Mode connection(s)", SOCKET_CONNECTIONS)
+            if ready_event is not None:
+                ready_event.set()
+            
+            threading.Event().wait()
         except Exception as e:
-            logger.error(f"Failed to start bot: {e}")
-            raise
-
-def main():
-    logger.info("Initializing Pennyworth Bot")
-    bot = PennyworthBot()
-    bot.start()
-
-if __name__ == "__main__":
-    main()
\ No newline at end of file
+            logger.error("Failed to start bot: %s", e)
+            raise
\ No newline at end of file
@@ -0,0 +1,447 @@
+"""
+LLM response caching for Pennyworth Service Bot
+Stores Gemini responses keyed by a SHA-256 hash of the rendered prompt
+"""
+
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import logging
+import math
+import threading
+from collections import OrderedDict, deque
+from typing import Optional, Dict, Callable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Cache policies (set via AI_CACHE_POLICY)
+POLICY_ENABLED = "enabled"      # Read cached responses and store new ones
+POLICY_READONLY = "readonly"    # Read cached responses, never store
+POLICY_REPLAY = "replay"        # Serve only cached responses, never call the model
+POLICY_DISABLED = "disabled"    # Bypass the cache entirely
+CACHE_POLICIES = (POLICY_ENABLED, POLICY_READONLY, POLICY_REPLAY, POLICY_DISABLED)
+
+
+def make_cache_key(*parts: str) -> str:
+    """
+    Build a cache key from the parts that determine a model response
+
+    Args:
+        *parts (str): Model name, rendered prompt, etc.
+
+    Returns:
+        Hex SHA-256 digest of the joined parts
+    """
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()
+
+
+def make_key_hasher(*prefix_parts: str) -> "hashlib._Hash":
+    """
+    Pre-hash the constant leading parts of cache keys
+    
+    hasher.copy() plus update(last_part) yields the same digest as
+    make_cache_key(*prefix_parts, last_part) without rehashing the prefix.
+
+    Args:
+        *prefix_parts (str): Model name, persona, etc.
+
+    Returns:
+        SHA-256 hasher seeded with the joined prefix
+    """
+    return hashlib.sha256(("|".join(prefix_parts) + "|").encode())
+
+
+class PromptCache:
+    # Writes between sweeps of expired and excess rows
+    PRUNE_EVERY = 100
+
+    def __init__(self, path: str = "cache.db", policy: str = POLICY_ENABLED, ttl: int = 3600,
+                 max_rows: int = 5000):
+        """
+        Initialize the persistent prompt -> response cache
+
+        Args:
+            path (str): SQLite database file
+            policy (str): One of CACHE_POLICIES
+            ttl (int): Seconds a stored response stays valid (ignored when replaying)
+            max_rows (int): Rows kept after each sweep (oldest are deleted first)
+        """
+        if policy not in CACHE_POLICIES:
+            logger.warning("Unknown AI cache policy '%s', falling back to '%s'", policy, POLICY_ENABLED)
+            policy = POLICY_ENABLED
+        self.policy = policy
+        self.ttl = ttl
+        self.max_rows = max_rows
+        self._lock = threading.Lock()
+        self._conn = None
+        self._writes = 0
+
+        if self.policy == POLICY_DISABLED:
+            return
+        try:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS ai_cache(key TEXT PRIMARY KEY, response TEXT, ts INTEGER)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS ai_cache_ts ON ai_cache(ts)")
+            self._conn.commit()
+            if self.policy == POLICY_ENABLED:
+                with self._lock:
+                    self._prune()
+            logger.info("AI response cache opened at %s (policy: %s)", path, self.policy)
+        except sqlite3.Error as e:
+            logger.warning("Could not open AI response cache at %s, caching disabled: %s", path, e)
+            self.policy = POLICY_DISABLED
+            self._conn = None
+
+    @classmethod
+    def from_env(cls) -> "PromptCache":
+        """Create a cache configured from AI_CACHE_POLICY, AI_CACHE_PATH, AI_CACHE_TTL and AI_CACHE_MAX_ROWS"""
+        return cls(
+            path=os.getenv('AI_CACHE_PATH', 'cache.db'),
+            policy=os.getenv('AI_CACHE_POLICY', POLICY_ENABLED).lower(),
+            ttl=int(os.getenv('AI_CACHE_TTL', 3600)),
+            max_rows=int(os.getenv('AI_CACHE_MAX_ROWS', 5000))
+        )
+
+    @property
+    def replaying(self) -> bool:
+        """Whether misses must fail instead of calling the model"""
+        return self.policy == POLICY_REPLAY
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response
+
+        Args:
+            key (str): Cache key from make_cache_key
+
+        Returns:
+            The cached response, or None on a miss or expired entry
+        """
+        if self._conn is None:
+            return None
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT response, ts FROM ai_cache WHERE key = ?", (key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning("AI response cache read failed: %s", e)
+            return None
+        if row is None:
+            return None
+        response, ts = row
+        if not self.replaying and time.time() - ts > self.ttl:
+            return None
+        return response
+
+    def set(self, key: str, response: str) -> None:
+        """
+        Store a response (only under the 'enabled' policy)
+
+        Args:
+            key (str): Cache key from make_cache_key
+            response (str): Model response text
+        """
+        if self._conn is None or self.policy != POLICY_ENABLED:
+            return
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO ai_cache(key, response, ts) VALUES (?, ?, ?)",
+                    (key, response, int(time.time()))
+                )
+                self._writes += 1
+                if self._writes % self.PRUNE_EVERY == 0:
+                    self._prune()
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning("AI response cache write failed: %s", e)
+
+    def _prune(self) -> None:
+        """Delete expired rows, then the oldest rows beyond max_rows (caller holds the lock)"""
+        self._conn.execute("DELETE FROM ai_cache WHERE ts < ?", (int(time.time()) - self.ttl,))
+        self._conn.execute(
+            "DELETE FROM ai_cache WHERE key IN "
+            "(SELECT key FROM ai_cache ORDER BY ts DESC LIMIT -1 OFFSET ?)",
+            (self.max_rows,)
+        )
+        self._conn.commit()
+
+
+class RedisCache:
+    def __init__(self, client, ttl: int = 3600, prefix: str = "pennyworth:ai:"):
+        """
+        Initialize the shared prompt -> response cache in Redis
+        
+        Lets every bot replica (and restarted pods) reuse each other's responses.
+
+        Args:
+            client: redis.Redis client
+            ttl (int): Seconds a stored response stays valid
+            prefix (str): Namespace prepended to every key
+        """
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    @classmethod
+    def from_env(cls) -> Optional["RedisCache"]:
+        """Create a cache from REDIS_URL and AI_CACHE_TTL (None when REDIS_URL is unset)"""
+        url = os.getenv('REDIS_URL')
+        if not url:
+            return None
+        try:
+            import redis
+        except ImportError:
+            logger.warning("REDIS_URL is set but the redis package is not installed; shared AI cache disabled")
+            return None
+        logger.info("Shared AI response cache enabled (Redis)")
+        return cls(
+            redis.Redis.from_url(url, decode_responses=True, socket_timeout=1),
+            ttl=int(os.getenv('AI_CACHE_TTL', 3600))
+        )
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response
+
+        Args:
+            key (str): Cache key from make_cache_key
+
+        Returns:
+            The cached response, or None on a miss or when Redis is unreachable
+        """
+        try:
+            return self.client.get(self.prefix + key)
+        except Exception as e:
+            logger.warning("Redis AI cache read failed: %s", e)
+            return None
+
+    def set(self, key: str, response: str) -> None:
+        """
+        Store a response with the cache TTL
+
+        Args:
+            key (str): Cache key from make_cache_key
+            response (str): Model response text
+        """
+        try:
+            self.client.setex(self.prefix + key, self.ttl, response)
+        except Exception as e:
+            logger.warning("Redis AI cache write failed: %s", e)
+
+
+class LLMCache:
+    def __init__(self, maxsize: int = 1024, ttl: int = 3600):
+        """
+        Initialize the in-memory LRU prompt -> response cache
+        
+        Sits in front of the persistent PromptCache so repeated prompts in a
+        running process are answered without touching disk or the model.
+
+        Args:
+            maxsize (int): Maximum number of responses kept (least recently used evicted first)
+            ttl (int): Seconds a stored response stays valid
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expiry, response)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @classmethod
+    def from_env(cls) -> "LLMCache":
+        """Create a cache configured from LLM_CACHE_SIZE and LLM_CACHE_TTL"""
+        return cls(
+            maxsize=int(os.getenv('LLM_CACHE_SIZE', 1024)),
+            ttl=int(os.getenv('LLM_CACHE_TTL', 3600))
+        )
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            return {'hits': self._hits, 'misses': self._misses, 'size': len(self._entries)}
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response
+
+        Args:
+            key (str): Cache key from make_cache_key
+
+        Returns:
+            The cached response, or None on a miss or expired entry
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() >= entry[0]:
+                if entry is not None:
+                    del self._entries[key]
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[1]
+
+    def set(self, key: str, response: str) -> None:
+        """
+        Store a response, evicting the least recently used entry when full
+
+        Args:
+            key (str): Cache key from make_cache_key
+            response (str): Model response text
+        """
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+class SemanticCache:
+    def __init__(self, embed: Callable[[str], List[float]], threshold: float = 0.92,
+                 maxsize: int = 256, ttl: int = 3600):
+        """
+        Initialize the embedding-similarity cache for free-form queries
+        
+        A query is answered from the cache when a previous query asked under the
+        same namespace (the rest of the prompt: persona, form of address, channel
+        context) has cosine similarity >= threshold.
+
+        Args:
+            embed (Callable): Function returning an embedding vector for a text
+            threshold (float): Minimum cosine similarity for a hit
+            maxsize (int): Maximum number of queries kept (oldest evicted first)
+            ttl (int): Seconds a stored response stays valid
+        """
+        self.embed = embed
+        self.threshold = threshold
+        self.ttl = ttl
+        self._entries = deque(maxlen=maxsize)  # (namespace, vector, norm, expiry, response)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @classmethod
+    def from_env(cls, embed: Callable[[str], List[float]]) -> Optional["SemanticCache"]:
+        """
+        Create a cache from SEMANTIC_CACHE_ENABLED, SEMANTIC_CACHE_THRESHOLD,
+        SEMANTIC_CACHE_SIZE and SEMANTIC_CACHE_TTL (None when disabled)
+        """
+        if os.getenv('SEMANTIC_CACHE_ENABLED', 'false').lower() not in ('1', 'true', 'yes'):
+            return None
+        return cls(
+            embed,
+            threshold=float(os.getenv('SEMANTIC_CACHE_THRESHOLD', 0.92)),
+            maxsize=int(os.getenv('SEMANTIC_CACHE_SIZE', 256)),
+            ttl=int(os.getenv('SEMANTIC_CACHE_TTL', 3600))
+        )
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            return {'hits': self._hits, 'misses': self._misses, 'size': len(self._entries)}
+
+    def lookup(self, namespace: str, query: str) -> Tuple[Optional[str], Optional[Tuple[List[float], float]]]:
+        """
+        Find the response to the most similar earlier query in a namespace
+
+        Args:
+            namespace (str): Everything in the prompt besides the query
+            query (str): The user's query
+
+        Returns:
+            Tuple of (cached response or None, query embedding for add(), or None
+            if the query could not be embedded)
+        """
+        try:
+            vector = self.embed(query)
+        except Exception as e:
+            logger.warning("Could not embed query for the semantic cache: %s", e)
+            return None, None
+        norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+        namespace_key = make_cache_key(namespace)
+
+        best_score = 0.0
+        best_response = None
+        now = time.monotonic()
+        with self._lock:
+            for entry_namespace, entry_vector, entry_norm, expiry, response in self._entries:
+                if entry_namespace != namespace_key or now >= expiry:
+                    continue
+                score = sum(a * b for a, b in zip(vector, entry_vector)) / (norm * entry_norm)
+                if score > best_score:
+                    best_score, best_response = score, response
+
+            if best_response is not None and best_score >= self.threshold:
+                self._hits += 1
+                return best_response, (vector, norm)
+            self._misses += 1
+        return None, (vector, norm)
+
+    def add(self, namespace: str, embedding: Tuple[List[float], float], response: str) -> None:
+        """
+        Store a response for a query embedding returned by lookup()
+
+        Args:
+            namespace (str): Everything in the prompt besides the query
+            embedding (Tuple): (vector, norm) from lookup()
+            response (str): Model response text
+        """
+        vector, norm = embedding
+        with self._lock:
+            self._entries.append((make_cache_key(namespace), vector, norm, time.monotonic() + self.ttl, response))
+
+
+_SHAPE_WORD_RE = re.compile(r"[a-z]+")
+
+
+def query_shape(query: str) -> str:
+    """
+    Key for structurally similar queries: the set of words, ignoring case,
+    order, digits and punctuation
+
+    Args:
+        query (str): The user's query
+
+    Returns:
+        Hex SHA-256 digest of the sorted distinct words
+    """
+    return make_cache_key(*sorted(set(_SHAPE_WORD_RE.findall(query.lower()))))
+
+
+class TemplateCache:
+    def __init__(self, maxsize: int = 256, ttl: int = 86400):
+        """
+        Initialize the cache of response templates for structurally similar queries
+        
+        Stores model answers written with {placeholders} instead of values, so
+        a later query of the same shape is answered by str.format with fresh data.
+
+        Args:
+            maxsize (int): Maximum number of templates kept
+            ttl (int): Seconds a template stays valid
+        """
+        self._templates = LLMCache(maxsize=maxsize, ttl=ttl)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current size"""
+        return self._templates.stats
+
+    def get(self, query: str) -> Optional[str]:
+        """Get the template stored for queries shaped like this one"""
+        return self._templates.get(query_shape(query))
+
+    def set(self, query: str, template: str) -> None:
+        """Store a template for queries shaped like this one"""
+        self._templates.set(query_shape(query), template)
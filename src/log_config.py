@@ -0,0 +1,19 @@
+"""
+Logging bootstrap for Pennyworth Service Bot
+Kept dependency-free so entry points can configure logging before heavy imports
+"""
+
+import os
+import logging
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+LOG_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def configure_logging() -> None:
+    """Configure the root logger once from LOG_LEVEL (later calls are no-ops)"""
+    logging.basicConfig(
+        level=os.getenv('LOG_LEVEL', 'INFO'),
+        format=LOG_FORMAT,
+        datefmt=LOG_DATE_FORMAT
+    )
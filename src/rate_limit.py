@@ -0,0 +1,144 @@
+"""
+Rate limiting module for Pennyworth Service Bot
+Token-bucket throttling for outbound API calls (Gemini, Trello, Slack)
+"""
+
+import time
+import logging
+import threading
+from typing import Optional, Any, Dict
+from slack_sdk import WebClient
+from slack_sdk.http_retry.builtin_handlers import RateLimitErrorRetryHandler
+
+logger = logging.getLogger(__name__)
+
+# Slack Web API rate-limit tiers (requests per minute)
+SLACK_TIER_RPM = {1: 1, 2: 20, 3: 50, 4: 100}
+
+# Requests per minute for the Slack methods the bot calls; unlisted methods use Tier 3
+SLACK_METHOD_RPM = {
+    'auth.test': SLACK_TIER_RPM[4],
+    'bots.info': SLACK_TIER_RPM[4],
+    'users.info': SLACK_TIER_RPM[4],
+    'users.list': SLACK_TIER_RPM[2],
+    'users.profile.set': SLACK_TIER_RPM[3],
+    'team.info': SLACK_TIER_RPM[3],
+    'conversations.info': SLACK_TIER_RPM[3],
+    'conversations.history': SLACK_TIER_RPM[3],
+    'chat.postMessage': 60,  # "Special" tier: roughly one message per second
+}
+
+
+class TokenBucket:
+    def __init__(self, requests_per_minute: float, tokens_per_minute: Optional[float] = None):
+        """
+        Initialize a token bucket with request and (optional) token budgets
+
+        Both budgets start full and refill continuously at their per-minute rate.
+
+        Args:
+            requests_per_minute (float): Maximum requests per minute
+            tokens_per_minute (float, optional): Maximum model tokens per minute
+        """
+        self.requests_per_minute = float(requests_per_minute)
+        self.tokens_per_minute = float(tokens_per_minute) if tokens_per_minute else None
+        self._requests = self.requests_per_minute
+        self._tokens = self.tokens_per_minute or 0.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        """Top up both budgets for the time elapsed since the last refill"""
+        elapsed = now - self._updated
+        self._updated = now
+        self._requests = min(
+            self.requests_per_minute,
+            self._requests + elapsed * self.requests_per_minute / 60
+        )
+        if self.tokens_per_minute:
+            self._tokens = min(
+                self.tokens_per_minute,
+                self._tokens + elapsed * self.tokens_per_minute / 60
+            )
+
+    def acquire(self, estimated_tokens: int = 0) -> float:
+        """
+        Block until one request (and the estimated tokens) can be spent
+
+        Args:
+            estimated_tokens (int): Tokens the call is expected to consume
+
+        Returns:
+            float: Seconds spent waiting for capacity
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                tokens = min(estimated_tokens, self.tokens_per_minute) if self.tokens_per_minute else 0
+                delay = max(0.0, (1 - self._requests) * 60 / self.requests_per_minute)
+                if self.tokens_per_minute:
+                    delay = max(delay, (tokens - self._tokens) * 60 / self.tokens_per_minute)
+
+                if delay <= 0:
+                    self._requests -= 1
+                    self._tokens -= tokens
+                    if waited:
+                        logger.debug("Rate limiter delayed call by %.2fs", waited)
+                    return waited
+
+            time.sleep(delay)
+            waited += delay
+
+
+class RateLimitedHTTPService:
+    def __init__(self, http_service: Any, bucket: TokenBucket):
+        """
+        Wrap a requests-style HTTP service so every request draws from a bucket
+
+        Args:
+            http_service (Any): requests module or Session exposing request()
+            bucket (TokenBucket): Bucket to acquire from before each request
+        """
+        self.http_service = http_service
+        self.bucket = bucket
+
+    def request(self, *args, **kwargs):
+        """Acquire capacity, then perform the request"""
+        self.bucket.acquire()
+        return self.http_service.request(*args, **kwargs)
+
+
+class RateLimitedWebClient(WebClient):
+    def __init__(self, *args, method_rpm: Optional[Dict[str, float]] = None, max_retry_count: int = 2, **kwargs):
+        """
+        Slack WebClient that throttles each API method to its documented tier
+        
+        Calls wait on a per-method token bucket before hitting Slack; any 429 that
+        still slips through is retried after the Retry-After delay.
+
+        Args:
+            method_rpm (Dict[str, float], optional): Per-method overrides of SLACK_METHOD_RPM
+            max_retry_count (int): Retries for rate-limited (429) responses
+        """
+        super().__init__(*args, **kwargs)
+        self.method_rpm = {**SLACK_METHOD_RPM, **(method_rpm or {})}
+        self._buckets = {}
+        self._buckets_lock = threading.Lock()
+        self.retry_handlers.append(RateLimitErrorRetryHandler(max_retry_count=max_retry_count))
+
+    def _bucket_for(self, api_method: str) -> TokenBucket:
+        """Get (or create) the token bucket for a Slack API method"""
+        with self._buckets_lock:
+            bucket = self._buckets.get(api_method)
+            if bucket is None:
+                bucket = TokenBucket(self.method_rpm.get(api_method, SLACK_TIER_RPM[3]))
+                self._buckets[api_method] = bucket
+            return bucket
+
+    def api_call(self, api_method: str, **kwargs):
+        """Acquire capacity for the method, then perform the API call"""
+        waited = self._bucket_for(api_method).acquire()
+        if waited:
+            logger.info("Throttled Slack %s call by %.2fs", api_method, waited)
+        return super().api_call(api_method, **kwargs)
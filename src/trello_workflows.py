@@ -4,16 +4,66 @@ Handles Trello board, list, and card operations
 """
 
 import logging
+import time
+import requests
 import trello
-from typing import Optional, List, Dict, Any
+from src.rate_limit import TokenBucket, RateLimitedHTTPService
+from typing import Optional, List, Dict, Any, Callable
 from datetime import datetime, timedelta
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Freshness lifetimes (seconds) for cached Trello API responses
+SHORT_TTL = 5
+NORMAL_TTL = 30
+# Upper bound on the extra freshness granted to slow API calls
+MAX_TTL_BUMP = 5
+
+
+def _parse_create_args(remainder: str) -> Dict[str, str]:
+    """Format: create Card Title in List Name"""
+    card_title, found, list_name = remainder.partition(" in ")
+    return {
+        "card_title": card_title.strip(),
+        "list_name": list_name.strip() if found else "To Do"  # Default
+    }
+
+
+def _parse_lists_args(remainder: str) -> Dict[str, str]:
+    """Format: lists Board Name"""
+    return {"board_name": remainder}
+
+
+def _parse_comment_args(remainder: str) -> Dict[str, str]:
+    """Format: comment card_id Comment text"""
+    comment_parts = remainder.split(None, 1)
+    if len(comment_parts) != 2:
+        return {}
+    return {"card_id": comment_parts[0], "comment_text": comment_parts[1]}
+
+
+def _parse_move_args(remainder: str) -> Dict[str, str]:
+    """Format: move card_id to List Name"""
+    card_id, found, list_name = remainder.partition(" to ")
+    if not found:
+        return {}
+    return {"card_id": card_id.strip(), "list_name": list_name.strip()}
+
+
+# Argument parsers per subcommand (commands without an entry take no arguments)
+_ARG_PARSERS: Dict[str, Callable[[str], Dict[str, str]]] = {
+    "create": _parse_create_args,
+    "lists": _parse_lists_args,
+    "comment": _parse_comment_args,
+    "move": _parse_move_args,
+}
+
 class TrelloWorkflow:
     def __init__(self, api_key: str = None, api_secret: str = None, token: Optional[str] = None, 
-                trello_client: Any = None, ai_generator: Any = None):
+                trello_client: Any = None, ai_generator: Any = None,
+                session: Optional[requests.Session] = None,
+                rate_limiter: Optional[TokenBucket] = None):
         """
         Initialize Trello workflow manager
         
@@ -23,25 +73,77 @@ class TrelloWorkflow:
             token (str, optional): Trello token for authenticated operations
             trello_client (Any, optional): Existing Trello client
             ai_generator (Any, optional): Function for generating task descriptions
+            session (requests.Session, optional): Shared HTTP session for connection reuse
+            rate_limiter (TokenBucket, optional): Bucket throttling Trello API requests
         """
         if trello_client:
             self.client = trello_client
         else:
+            http_service = session if session is not None else requests
+            if rate_limiter:
+                http_service = RateLimitedHTTPService(http_service, rate_limiter)
             self.client = trello.TrelloClient(
                 api_key=api_key,
                 api_secret=api_secret,
-                token=token
+                token=token,
+                http_service=http_service
             )
         self.ai_generator = ai_generator
         self._cache = {
             'boards': {},
             'lists': {},
+            'responses': {},
         }
         # Channel mapping (board_id -> slack_channel_id)
         self.channel_mapping = {}
         
         logger.info("Trello workflow manager initialized")
 
+    def _cached(self, key: str, ttl: float, fetch: Callable[[], Any]) -> Any:
+        """
+        Return a cached API response, refreshing it once its TTL has expired
+        
+        Slow calls extend the TTL by their own duration (capped at MAX_TTL_BUMP),
+        so the cache absorbs more load while Trello is struggling. If a refresh
+        fails, the last known response is served instead of raising.
+        
+        Args:
+            key (str): Cache key for the response
+            ttl (float): Freshness lifetime in seconds
+            fetch (Callable): Function performing the API call
+        
+        Returns:
+            The cached or freshly fetched response
+        """
+        entry = self._cache['responses'].get(key)
+        if entry and time.monotonic() < entry[0]:
+            return entry[1]
+        
+        start = time.monotonic()
+        try:
+            value = fetch()
+        except Exception as e:
+            if entry:
+                logger.warning("Trello request '%s' failed, serving stale response: %s", key, e)
+                return entry[1]
+            raise
+        
+        finished = time.monotonic()
+        self._cache['responses'][key] = (finished + ttl + min(finished - start, MAX_TTL_BUMP), value)
+        return value
+
+    def _invalidate(self, key: str) -> None:
+        """Drop a cached API response so the next lookup refetches it"""
+        self._cache['responses'].pop(key, None)
+
+    def _list_boards(self) -> List[trello.Board]:
+        """List all boards, served from the response cache when fresh"""
+        return self._cached('boards', NORMAL_TTL, self.client.list_boards)
+
+    def _list_lists(self, board: trello.Board) -> List[trello.List]:
+        """List all lists on a board, served from the response cache when fresh"""
+        return self._cached(f"lists:{board.id}", SHORT_TTL, board.list_lists)
+
     def get_board(self, board_name: str) -> Optional[trello.Board]:
         """
         Get a board by name
@@ -57,13 +159,13 @@ class TrelloWorkflow:
             return self._cache['boards'][board_name]
             
         # Otherwise, fetch from API
-        all_boards = self.client.list_boards()
+        all_boards = self._list_boards()
         for board in all_boards:
             if board.name.lower() == board_name.lower():
                 self._cache['boards'][board_name] = board
                 return board
         
-        logger.warning(f"Board not found: {board_name}")
+        logger.warning("Board not found: %s", board_name)
         return None
     
     def get_list(self, board_name: str, list_name: str) -> Optional[trello.List]:
@@ -85,12 +187,12 @@ class TrelloWorkflow:
         if not board:
             return None
             
-        for lst in board.list_lists():
+        for lst in self._list_lists(board):
             if lst.name.lower() == list_name.lower():
                 self._cache['lists'][cache_key] = lst
                 return lst
         
-        logger.warning(f"List not found: {list_name} on board {board_name}")        
+        logger.warning("List not found: %s on board %s", list_name, board_name)        
         return None
     
     def create_card(self, board_name: str, list_name: str, 
@@ -136,9 +238,9 @@ class TrelloWorkflow:
                     due_datetime = datetime.strptime(due_date, "%Y-%m-%d")
                     card.set_due(due_datetime.strftime("%Y-%m-%dT%H:%M:%S.000Z"))
                 except ValueError:
-                    logger.warning(f"Invalid due date format: {due_date}, expected YYYY-MM-DD")
+                    logger.warning("Invalid due date format: %s, expected YYYY-MM-DD", due_date)
             
-            logger.info(f"Created card: '{title}' on board '{board_name}' in list '{list_name}'")
+            logger.info("Created card: '%s' on board '%s' in list '%s'", title, board_name, list_name)
             return {
                 'success': True, 
                 'card_id': card.id, 
@@ -147,7 +249,7 @@ class TrelloWorkflow:
             }
             
         except Exception as e:
-            logger.error(f"Error creating Trello card: {e}")
+            logger.error("Error creating Trello card: %s", e)
             return {'success': False, 'error': str(e)}
     
     def move_card(self, card_id: str, target_list_name: str) -> Dict[str, Any]:
@@ -171,7 +273,7 @@ class TrelloWorkflow:
             
             # Find the target list
             target_list = None
-            for lst in board.list_lists():
+            for lst in self._list_lists(board):
                 if lst.name.lower() == target_list_name.lower():
                     target_list = lst
                     break
@@ -182,11 +284,11 @@ class TrelloWorkflow:
             # Move the card
             card.change_list(target_list.id)
             
-            logger.info(f"Moved card {card.name} to list {target_list_name}")
+            logger.info("Moved card %s to list %s", card.name, target_list_name)
             return {'success': True, 'message': f"Card moved to {target_list_name}"}
             
         except Exception as e:
-            logger.error(f"Error moving Trello card: {e}")
+            logger.error("Error moving Trello card: %s", e)
             return {'success': False, 'error': str(e)}
 
     def create_board(self, board_name: str, description: Optional[str] = None) -> Dict[str, Any]:
@@ -206,8 +308,9 @@ class TrelloWorkflow:
             
             # Cache the new board
             self._cache['boards'][board_name] = new_board
+            self._invalidate('boards')
             
-            logger.info(f"Created new board: {board_name}")
+            logger.info("Created new board: %s", board_name)
             return {
                 'success': True,
                 'board_id': new_board.id,
@@ -216,7 +319,7 @@ class TrelloWorkflow:
             }
             
         except Exception as e:
-            logger.error(f"Error creating Trello board: {e}")
+            logger.error("Error creating Trello board: %s", e)
             return {'success': False, 'error': str(e)}
 
     def create_list(self, board_name: str, list_name: str) -> Dict[str, Any]:
@@ -241,12 +344,13 @@ class TrelloWorkflow:
             # Update cache
             cache_key = f"{board_name}:{list_name}"
             self._cache['lists'][cache_key] = new_list
+            self._invalidate(f"lists:{board.id}")
             
-            logger.info(f"Created new list '{list_name}' on board '{board_name}'")
+            logger.info("Created new list '%s' on board '%s'", list_name, board_name)
             return {'success': True, 'list_name': list_name}
             
         except Exception as e:
-            logger.error(f"Error creating Trello list: {e}")
+            logger.error("Error creating Trello list: %s", e)
             return {'success': False, 'error': str(e)}
 
     def add_comment(self, card_id: str, comment: str) -> Dict[str, Any]:
@@ -267,11 +371,11 @@ class TrelloWorkflow:
             
             card.comment(comment)
             
-            logger.info(f"Added comment to card {card.name}")
+            logger.info("Added comment to card %s", card.name)
             return {'success': True, 'message': "Comment added"}
             
         except Exception as e:
-            logger.error(f"Error adding comment to Trello card: {e}")
+            logger.error("Error adding comment to Trello card: %s", e)
             return {'success': False, 'error': str(e)}
 
     def archive_card(self, card_id: str) -> Dict[str, Any]:
@@ -291,11 +395,11 @@ class TrelloWorkflow:
             
             card.set_closed(True)
             
-            logger.info(f"Archived card {card.name}")
+            logger.info("Archived card %s", card.name)
             return {'success': True, 'message': "Card archived"}
             
         except Exception as e:
-            logger.error(f"Error archiving Trello card: {e}")
+            logger.error("Error archiving Trello card: %s", e)
             return {'success': False, 'error': str(e)}
 
     def map_board_to_channel(self, board_name: str, channel_id: str) -> Dict[str, Any]:
@@ -316,11 +420,11 @@ class TrelloWorkflow:
             
             self.channel_mapping[board.id] = channel_id
             
-            logger.info(f"Mapped board '{board_name}' to Slack channel {channel_id}")
+            logger.info("Mapped board '%s' to Slack channel %s", board_name, channel_id)
             return {'success': True, 'message': f"Board '{board_name}' now linked to channel"}
             
         except Exception as e:
-            logger.error(f"Error mapping board to channel: {e}")
+            logger.error("Error mapping board to channel: %s", e)
             return {'success': False, 'error': str(e)}
 
     def get_upcoming_due_cards(self, days_ahead: int = 2) -> List[Dict[str, Any]]:
@@ -339,7 +443,7 @@ class TrelloWorkflow:
         
         try:
             # Get all boards
-            boards = self.client.list_boards()
+            boards = self._list_boards()
             
             for board in boards:
                 board_name = board.name
@@ -348,7 +452,7 @@ class TrelloWorkflow:
                 channel_id = self.channel_mapping.get(board.id)
                 
                 # Get all cards on the board
-                for lst in board.list_lists():
+                for lst in self._list_lists(board):
                     for card in lst.list_cards():
                         # Check if card has a due date
                         if card.due_date:
@@ -368,13 +472,13 @@ class TrelloWorkflow:
                                         'channel_id': channel_id
                                     })
                             except ValueError:
-                                logger.warning(f"Invalid due date format for card {card.name}: {card.due_date}")
+                                logger.warning("Invalid due date format for card %s: %s", card.name, card.due_date)
             
-            logger.info(f"Found {len(upcoming_cards)} cards due in the next {days_ahead} days")
+            logger.info("Found %s cards due in the next %s days", len(upcoming_cards), days_ahead)
             return upcoming_cards
             
         except Exception as e:
-            logger.error(f"Error checking for upcoming due cards: {e}")
+            logger.error("Error checking for upcoming due cards: %s", e)
             return []
 
     def get_boards(self) -> Dict[str, Any]:
@@ -385,13 +489,13 @@ class TrelloWorkflow:
             Dict with boards list and status
         """
         try:
-            boards = self.client.list_boards()
+            boards = self._list_boards()
             return {
                 "success": True,
                 "boards": [{"name": b.name, "id": b.id} for b in boards]
             }
         except Exception as e:
-            logger.error(f"Error retrieving Trello boards: {str(e)}")
+            logger.error("Error retrieving Trello boards: %s", e)
             return {"success": False, "error": str(e)}
             
     def get_lists(self, board_name: str) -> Dict[str, Any]:
@@ -412,7 +516,7 @@ class TrelloWorkflow:
                     "error": f"Board '{board_name}' not found"
                 }
                 
-            lists = board.list_lists()
+            lists = self._list_lists(board)
             
             return {
                 "success": True,
@@ -420,7 +524,7 @@ class TrelloWorkflow:
                 "lists": [{"name": lst.name, "id": lst.id} for lst in lists]
             }
         except Exception as e:
-            logger.error(f"Error retrieving lists for board '{board_name}': {str(e)}")
+            logger.error("Error retrieving lists for board '%s': %s", board_name, e)
             return {"success": False, "error": str(e)}
 
     def parse_command(self, command_text: str) -> tuple:
@@ -433,39 +537,11 @@ class TrelloWorkflow:
         Returns:
             Tuple of command name and parsed arguments
         """
-        parts = command_text.strip().split(' ', 1)
+        # Single whitespace-tolerant split into command and remainder
+        parts = command_text.split(None, 1)
         command = parts[0].lower() if parts else ""
-        args = {}
         
-        if len(parts) > 1:
-            remainder = parts[1].strip()
-            
-            if command == "create":
-                # Format: create Card Title in List Name
-                if " in " in remainder:
-                    card_title, list_name = remainder.split(" in ", 1)
-                    args["card_title"] = card_title.strip()
-                    args["list_name"] = list_name.strip()
-                else:
-                    args["card_title"] = remainder
-                    args["list_name"] = "To Do"  # Default
-            
-            elif command == "lists":
-                # Format: lists Board Name
-                args["board_name"] = remainder
-            
-            elif command == "comment":
-                # Format: comment card_id Comment text
-                comment_parts = remainder.split(' ', 1)
-                if len(comment_parts) >= 2:
-                    args["card_id"] = comment_parts[0].strip()
-                    args["comment_text"] = comment_parts[1].strip()
-                    
-            elif command == "move":
-                # Format: move card_id to List Name
-                if " to " in remainder:
-                    card_id, list_name = remainder.split(" to ", 1)
-                    args["card_id"] = card_id.strip()
-                    args["list_name"] = list_name.strip()
+        parser = _ARG_PARSERS.get(command)
+        args = parser(parts[1].strip()) if parser and len(parts) > 1 else {}
         
         return command, args
\ No newline at end of file
@@ -4,9 +4,14 @@ Utility modules for Pennyworth Service Bot
 
 import re
 import json
+import logging
+import requests
+from requests.adapters import HTTPAdapter
 from datetime import datetime, timezone
 from typing import Dict, Any, Optional, List
 
+logger = logging.getLogger(__name__)
+
 def parse_command(text: str) -> Dict[str, Any]:
     """
     Parse a command string into command and arguments
@@ -89,4 +94,22 @@ def create_thread_reply(message: str, thread_ts: str) -> Dict[str, Any]:
     """Create a message that replies in a thread"""
     response = format_slack_message(message)
     response['thread_ts'] = thread_ts
-    return response
\ No newline at end of file
+    return response
+
+def create_http_session(pool_connections: int = 32, pool_maxsize: int = 64, max_retries: int = 3) -> requests.Session:
+    """
+    Create a pooled HTTP session that keeps connections alive between calls
+    
+    Args:
+        pool_connections (int): Number of host connection pools to cache
+        pool_maxsize (int): Maximum connections kept per host
+        max_retries (int): Retries for failed connection attempts
+        
+    Returns:
+        requests.Session with keep-alive pooling on HTTPS
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=max_retries)
+    session.mount('https://', adapter)
+    logger.debug(f"Created pooled HTTP session (pool_maxsize={pool_maxsize})")
+    return session